@@ -0,0 +1,92 @@
+"""store_video_status_as_smallint
+
+Revision ID: c3a91e5d7b20
+Revises: 2024_01_15_new_arch
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a91e5d7b20"
+down_revision: Union[str, Sequence[str], None] = "2024_01_15_new_arch"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Codes match the enum definition order (see app.db.models.StatusCode)
+STATUS_LABELS = ("PENDING", "PROCESSING", "COMPLETED", "FAILED")
+
+
+def _status_type(table: str):
+    """Current type of table.status, or None if the table does not exist.
+
+    The legacy tasks table is dropped by the new-architecture migration but is
+    recreated by init_db's create_all, so it may or may not be present.
+    """
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    for column in inspector.get_columns(table):
+        if column["name"] == "status":
+            return column["type"]
+    return None
+
+
+def _status_to_smallint(table: str, enum_name: str) -> None:
+    status_type = _status_type(table)
+    if status_type is None or isinstance(status_type, sa.SmallInteger):
+        return
+
+    cases = " ".join(
+        f"WHEN '{label}' THEN {code}" for code, label in enumerate(STATUS_LABELS)
+    )
+    op.alter_column(table, "status", server_default=None)
+    op.alter_column(
+        table,
+        "status",
+        type_=sa.SmallInteger(),
+        existing_nullable=False,
+        postgresql_using=f"CASE status::text {cases} END",
+    )
+    op.alter_column(table, "status", server_default="0")
+    op.execute(f"DROP TYPE IF EXISTS {enum_name}")
+
+
+def _status_to_enum(table: str, enum_name: str) -> None:
+    status_type = _status_type(table)
+    if status_type is None or not isinstance(status_type, sa.SmallInteger):
+        return
+
+    status_enum = postgresql.ENUM(*STATUS_LABELS, name=enum_name)
+    status_enum.create(op.get_bind(), checkfirst=True)
+
+    cases = " ".join(
+        f"WHEN {code} THEN '{label}'" for code, label in enumerate(STATUS_LABELS)
+    )
+    op.alter_column(table, "status", server_default=None)
+    op.alter_column(
+        table,
+        "status",
+        type_=status_enum,
+        existing_nullable=False,
+        postgresql_using=f"(CASE status {cases} END)::{enum_name}",
+    )
+    op.alter_column(table, "status", server_default="PENDING")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _status_to_smallint("videos", "processingstatus")
+    _status_to_smallint("tasks", "taskstatus")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _status_to_enum("tasks", "taskstatus")
+    _status_to_enum("videos", "processingstatus")
@@ -11,7 +11,7 @@ from sqlalchemy.orm import selectinload
 
 from app.api.dependencies import get_current_user
 from app.db.models import Quiz, Segment, User, UserAnswer
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.schemas.quiz import (
     QuizAnswerRequest,
     QuizAnswerResponse,
@@ -38,7 +38,7 @@ async def _compute_user_stats(db: AsyncSession, user_id: int) -> UserStatsUpdate
     correct = (await db.execute(correct_stmt)).scalar_one() or 0
     accuracy = round((correct / total) * 100, 2) if total else 0.0
 
-    return UserStatsUpdate(
+    return UserStatsUpdate.model_construct(
         total_answered=total,
         total_correct=correct,
         accuracy=accuracy,
@@ -136,7 +136,7 @@ async def submit_quiz_answer(
 )
 async def get_segment_status(
     segment_id: int,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[User, Depends(get_current_user)],
 ):
     """
@@ -178,7 +178,7 @@ async def get_segment_status(
     )
     is_complete = total_questions > 0 and answered_questions >= total_questions
 
-    return SegmentAnswerStatus(
+    return SegmentAnswerStatus.model_construct(
         segment_id=segment_num,
         total_questions=total_questions,
         answered_questions=answered_questions,
@@ -195,7 +195,7 @@ async def get_segment_status(
 )
 async def review_segment_answers(
     segment_id: int,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[User, Depends(get_current_user)],
 ):
     """
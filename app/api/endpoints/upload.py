@@ -1,6 +1,5 @@
 import asyncio
 import base64
-import hashlib
 import logging
 from pathlib import Path
 
@@ -9,18 +8,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.db import get_db, get_redis
-from app.schemas.models import (
-    TaskStatus,
-    VideoUploadResponse,
-    VideoURLRequest,
-    VideoURLResponse,
-)
+from app.schemas.models import TaskStatus, VideoURLRequest, VideoURLResponse
+from app.schemas.video import VideoUploadResponse
 from app.services.pipeline import (
     create_task,
     process_video_from_file,
     process_video_from_url,
 )
-from app.services.storage_service import storage_service
+from app.services.storage_service import VIDEO_MEDIA_TYPES, storage_service
 from app.services.task_service import TaskService
 
 logger = logging.getLogger(__name__)
@@ -58,7 +53,7 @@ async def upload_video_file(
         content = await file.read()
 
         # Calculate file hash for duplicate detection
-        file_hash = hashlib.sha256(content).hexdigest()
+        file_hash = TaskService.calculate_content_hash(content)
 
         # Check for duplicates
         task_service = TaskService(db)
@@ -90,15 +85,7 @@ async def upload_video_file(
             try:
                 s3_key = storage_service.get_object_key_for_task(task_id, file.filename)
                 # Detect content type
-                content_type_map = {
-                    ".mp4": "video/mp4",
-                    ".avi": "video/x-msvideo",
-                    ".mov": "video/quicktime",
-                    ".mkv": "video/x-matroska",
-                    ".webm": "video/webm",
-                    ".flv": "video/x-flv",
-                }
-                content_type = content_type_map.get(file_ext, "video/mp4")
+                content_type = VIDEO_MEDIA_TYPES.get(file_ext, "video/mp4")
 
                 # Encode non-ASCII filename for S3 metadata
                 encoded_filename = base64.b64encode(
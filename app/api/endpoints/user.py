@@ -8,7 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_user
 from app.db.models import User
-from app.db.session import get_db
+from app.db.session import get_read_db
 from app.schemas.user import (
     UserHistoryResponse,
     UserProfileResponse,
@@ -31,7 +31,7 @@ def _service(db: AsyncSession) -> UserStatsService:
     "/profile", response_model=UserProfileResponse, status_code=status.HTTP_200_OK
 )
 async def get_user_profile(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[User, Depends(get_current_user)],
 ):
     """
@@ -61,7 +61,7 @@ async def get_user_profile(
 
 @router.get("/stats", response_model=UserStatsResponse, status_code=status.HTTP_200_OK)
 async def get_user_stats(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[User, Depends(get_current_user)],
     limit_topics: int = Query(10, ge=1, le=50, description="Max topics to return"),
 ):
@@ -84,7 +84,7 @@ async def get_user_stats(
     "/history", response_model=UserHistoryResponse, status_code=status.HTTP_200_OK
 )
 async def get_user_history(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[User, Depends(get_current_user)],
     page: int = Query(1, ge=1, description="Page number (1-based)"),
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
@@ -108,7 +108,7 @@ async def get_user_history(
     "/topics", response_model=UserTopicsResponse, status_code=status.HTTP_200_OK
 )
 async def get_user_topics(
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[User, Depends(get_current_user)],
     limit: int = Query(10, ge=1, le=50, description="Max topics/keywords to return"),
 ):
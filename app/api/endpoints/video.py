@@ -3,15 +3,15 @@ from pathlib import Path
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import FileResponse, StreamingResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.db import get_db
+from app.db import get_db, get_read_db
 from app.db.models import TaskStatus as DBTaskStatus
 from app.schemas.models import SegmentsResponse, TaskStatusResponse
 from app.services.pipeline import get_task, get_task_segments, get_task_status
-from app.services.storage_service import storage_service
+from app.services.storage_service import VIDEO_MEDIA_TYPES, storage_service
 from app.services.task_service import TaskService
 
 logger = logging.getLogger(__name__)
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/video", tags=["video"])
 
 
 @router.get("/{task_id}/status", response_model=TaskStatusResponse)
-async def get_video_status(task_id: str, db: AsyncSession = Depends(get_db)):
+async def get_video_status(task_id: str, db: AsyncSession = Depends(get_read_db)):
     """
     Get current processing status of a video task
 
@@ -60,7 +60,7 @@ async def get_video_status(task_id: str, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/{task_id}/segments", response_model=SegmentsResponse)
-async def get_video_segments(task_id: str, db: AsyncSession = Depends(get_db)):
+async def get_video_segments(task_id: str, db: AsyncSession = Depends(get_read_db)):
     """
     Get processed video segments with quizzes
 
@@ -99,7 +99,9 @@ async def get_video_segments(task_id: str, db: AsyncSession = Depends(get_db)):
             video_title=db_task.original_filename,
         )
 
-        return response
+        return Response(
+            content=response.model_dump_json(), media_type="application/json"
+        )
 
     except HTTPException:
         raise
@@ -111,7 +113,7 @@ async def get_video_segments(task_id: str, db: AsyncSession = Depends(get_db)):
 
 
 @router.get("/{task_id}/file")
-async def get_video_file(task_id: str, db: AsyncSession = Depends(get_db)):
+async def get_video_file(task_id: str, db: AsyncSession = Depends(get_read_db)):
     """
     Get the video file for a completed task
 
@@ -164,15 +166,7 @@ async def get_video_file(task_id: str, db: AsyncSession = Depends(get_db)):
 
                 # Detect media type from extension
                 ext = Path(video_path).suffix.lower()
-                media_type_map = {
-                    ".mp4": "video/mp4",
-                    ".avi": "video/x-msvideo",
-                    ".mov": "video/quicktime",
-                    ".mkv": "video/x-matroska",
-                    ".webm": "video/webm",
-                    ".flv": "video/x-flv",
-                }
-                media_type = media_type_map.get(ext, "video/mp4")
+                media_type = VIDEO_MEDIA_TYPES.get(ext, "video/mp4")
 
                 # Get file from S3 and stream it
                 async def stream_from_s3():
@@ -206,15 +200,7 @@ async def get_video_file(task_id: str, db: AsyncSession = Depends(get_db)):
 
         # Detect media type from extension
         ext = local_path.suffix.lower()
-        media_type_map = {
-            ".mp4": "video/mp4",
-            ".avi": "video/x-msvideo",
-            ".mov": "video/quicktime",
-            ".mkv": "video/x-matroska",
-            ".webm": "video/webm",
-            ".flv": "video/x-flv",
-        }
-        media_type = media_type_map.get(ext, "video/mp4")
+        media_type = VIDEO_MEDIA_TYPES.get(ext, "video/mp4")
 
         # Return video file with proper headers for streaming
         # Use ASCII-safe filename encoding for Content-Disposition
@@ -3,18 +3,22 @@
 import asyncio
 import logging
 from typing import Annotated, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.api.dependencies import get_current_user_optional
 from app.db.models import ProcessingStatus, User, Video
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, get_db, get_read_db, get_redis
 from app.schemas.models import ProcessingTask, TaskStatus, VideoMetadata
 from app.schemas.video import (
+    SegmentSchema,
     SegmentsResponse,
     VideoCheckRequest,
     VideoCheckResponse,
@@ -22,6 +26,7 @@ from app.schemas.video import (
     VideoUploadResponse,
 )
 from app.services.pipeline import TASKS, process_video_from_url
+from app.services.task_service import segments_cache_key
 from app.utils.video_utils import normalize_youtube_url
 
 logger = logging.getLogger(__name__)
@@ -29,10 +34,17 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/video", tags=["Video"])
 
 
+def _video_etag(video: Video) -> Optional[str]:
+    """Weak ETag for a finished video; in-progress videos are not cacheable."""
+    if video.completed_at is None or video.status != ProcessingStatus.COMPLETED:
+        return None
+    return f'W/"{video.id}-{int(video.completed_at.timestamp())}"'
+
+
 @router.post("/check", response_model=VideoCheckResponse)
 async def check_video(
     request: VideoCheckRequest,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[Optional[User], Depends(get_current_user_optional)] = None,
 ):
     """
@@ -131,9 +143,7 @@ async def upload_video_url(
                 logger.info(
                     f"Retrying failed video: {normalized_url} (language: {request.language})"
                 )
-                # Delete old failed video
-                await db.delete(existing_video)
-                await db.commit()
+                # Reset the failed row in place via the upsert below
             else:
                 # PENDING status
                 task_id_str = str(existing_video.task_id)
@@ -165,23 +175,58 @@ async def upload_video_url(
                     message="Video processing will start soon. Connect via WebSocket for updates.",
                 )
 
-        # Create new video entry
-        new_video = Video(
+        # Create the video entry, or reset a failed one under a fresh task id,
+        # in one statement; a row claimed concurrently is left untouched
+        insert_stmt = pg_insert(Video).values(
             url=normalized_url,
             language=request.language,
+            task_id=uuid4(),
             status=ProcessingStatus.PENDING,
             user_id=current_user.id if current_user else None,
         )
-        db.add(new_video)
+        excluded = insert_stmt.excluded
+        result = await db.execute(
+            insert_stmt.on_conflict_do_update(
+                constraint="uq_video_url_language",
+                set_={
+                    "task_id": excluded.task_id,
+                    "status": excluded.status,
+                    "user_id": excluded.user_id,
+                    "created_at": excluded.created_at,
+                    "title": None,
+                    "duration": None,
+                    "file_path": None,
+                    "progress": 0.0,
+                    "current_stage": None,
+                    "error_message": None,
+                    "processed_at": None,
+                    "started_at": None,
+                    "completed_at": None,
+                },
+                where=Video.status == ProcessingStatus.FAILED,
+            ).returning(Video.task_id)
+        )
+        new_task_id = result.scalar_one_or_none()
         await db.commit()
-        await db.refresh(new_video)
+
+        if new_task_id is None:
+            result = await db.execute(
+                select(Video.task_id).where(
+                    Video.url == normalized_url, Video.language == request.language
+                )
+            )
+            return VideoUploadResponse(
+                task_id=str(result.scalar_one()),
+                cached=False,
+                message="Video is currently being processed. Connect via WebSocket for updates.",
+            )
 
         logger.info(
-            f"New video created: {new_video.task_id} - URL: {request.url} (language: {request.language})"
+            f"New video created: {new_task_id} - URL: {request.url} (language: {request.language})"
         )
 
         # Register in-memory task (pipeline cache) and start processing
-        task_id_str = str(new_video.task_id)
+        task_id_str = str(new_task_id)
         TASKS[task_id_str] = ProcessingTask(
             task_id=task_id_str,
             status=TaskStatus.PENDING,
@@ -218,7 +263,8 @@ async def upload_video_url(
 @router.get("/{task_id}/segments", response_model=SegmentsResponse)
 async def get_video_segments(
     task_id: str,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     current_user: Annotated[Optional[User], Depends(get_current_user_optional)] = None,
 ):
     """
@@ -237,6 +283,27 @@ async def get_video_segments(
                 detail="Invalid task_id format. Must be a valid UUID.",
             )
 
+        # Completed videos are served straight from Redis on repeat reads
+        cache_key = segments_cache_key(task_id)
+        redis = None
+        try:
+            redis = await get_redis()
+            cached = await redis.hgetall(cache_key)
+        except Exception as e:
+            logger.warning(f"Segments cache read failed: {e}")
+            cached = None
+        if cached:
+            etag = cached["etag"]
+            if request.headers.get("if-none-match") == etag:
+                return Response(
+                    status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+                )
+            return Response(
+                content=cached["body"],
+                media_type="application/json",
+                headers={"ETag": etag},
+            )
+
         # Query video with segments and quizzes eagerly loaded
         from app.db.models import Segment
 
@@ -253,28 +320,38 @@ async def get_video_segments(
                 detail=f"Video with task_id {task_id} not found",
             )
 
-        # Build response
-        segments_data = []
-        if video.segments:
-            for segment in video.segments:
-                # Get quizzes for this segment
-                quizzes_data = []
-                if segment.quizzes:
-                    for quiz in segment.quizzes:
-                        # Don't include correct_index in response (user shouldn't see it until they answer)
-                        quizzes_data.append(quiz.to_dict(include_correct=False))
-
-                # Add segment with quizzes
-                segment_dict = segment.to_dict(include_quizzes=False)
-                segment_dict["quizzes"] = quizzes_data
-                segments_data.append(segment_dict)
-
-        return SegmentsResponse(
+        etag = _video_etag(video)
+        if etag is not None and request.headers.get("if-none-match") == etag:
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+            )
+
+        # correct_index stays hidden until the user answers
+        segments_data = [SegmentSchema.from_db(segment) for segment in video.segments]
+
+        payload = SegmentsResponse(
             task_id=task_id,
             status=video.status.value,
             total_segments=len(video.segments) if video.segments else None,
             segments=segments_data,
         )
+        # Serialize in pydantic-core directly instead of FastAPI's
+        # model -> dict -> jsonable_encoder -> json.dumps path
+        body = payload.model_dump_json()
+        if etag is None:
+            return Response(content=body, media_type="application/json")
+
+        if redis is not None:
+            try:
+                async with redis.pipeline(transaction=False) as pipe:
+                    pipe.hset(cache_key, mapping={"etag": etag, "body": body})
+                    pipe.expire(cache_key, settings.SEGMENTS_CACHE_TTL)
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Segments cache write failed: {e}")
+        return Response(
+            content=body, media_type="application/json", headers={"ETag": etag}
+        )
 
     except HTTPException:
         raise
@@ -286,10 +363,55 @@ async def get_video_segments(
         )
 
 
+@router.get("/{task_id}/segments.ndjson")
+async def stream_video_segments(
+    task_id: str,
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+):
+    """
+    Stream segments of a video as NDJSON, one segment per line.
+
+    - **task_id**: Task ID from upload response
+    - Rows are fetched and serialized incrementally, so long videos don't
+      build one large response in memory
+    """
+    try:
+        task_uuid = UUID(task_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid task_id format. Must be a valid UUID.",
+        )
+
+    video_id = await db.scalar(select(Video.id).where(Video.task_id == task_uuid))
+    if video_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Video with task_id {task_id} not found",
+        )
+
+    from app.db.models import Segment
+
+    async def generate():
+        # Server-side cursors need a transaction, so use the write pool here
+        async with AsyncSessionLocal() as session:
+            result = await session.stream_scalars(
+                select(Segment)
+                .where(Segment.video_id == video_id)
+                .order_by(Segment.segment_id)
+                .options(selectinload(Segment.quizzes))
+                .execution_options(yield_per=50)
+            )
+            async for segment in result:
+                yield SegmentSchema.from_db(segment).model_dump_json() + "\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.get("/{task_id}/status")
 async def get_video_status(
     task_id: str,
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
 ):
     """
     Get current processing status of a video.
@@ -307,9 +429,19 @@ async def get_video_status(
                 detail="Invalid task_id format. Must be a valid UUID.",
             )
 
-        # Query video
-        result = await db.execute(select(Video).where(Video.task_id == task_uuid))
-        video = result.scalar_one_or_none()
+        # Query only the status columns; this endpoint is polled frequently
+        result = await db.execute(
+            select(
+                Video.status,
+                Video.progress,
+                Video.current_stage,
+                Video.error_message,
+                Video.created_at,
+                Video.started_at,
+                Video.completed_at,
+            ).where(Video.task_id == task_uuid)
+        )
+        video = result.one_or_none()
 
         if not video:
             raise HTTPException(
@@ -10,11 +10,13 @@ from app.db.models import (
     Video,
 )
 from app.db.session import (
+    AsyncReadSessionLocal,
     AsyncSessionLocal,
     Base,
     close_db,
     close_redis,
     get_db,
+    get_read_db,
     get_redis,
     init_db,
 )
@@ -29,7 +31,9 @@ __all__ = [
     "UserAnswer",
     "ProcessingStatus",
     "AsyncSessionLocal",
+    "AsyncReadSessionLocal",
     "get_db",
+    "get_read_db",
     "get_redis",
     "init_db",
     "close_db",
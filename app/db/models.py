@@ -9,12 +9,13 @@ from sqlalchemy import (
     Boolean,
     Column,
     DateTime,
-    Enum,
     Float,
     ForeignKey,
     Integer,
+    SmallInteger,
     String,
     Text,
+    TypeDecorator,
     UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
@@ -41,6 +42,32 @@ class TaskStatus(str, PyEnum):
     FAILED = "failed"
 
 
+class StatusCode(TypeDecorator):
+    """Store a status enum as a SMALLINT ordinal instead of a PG enum label.
+
+    Codes follow member definition order, so new members must be appended.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls):
+        super().__init__()
+        self.enum_cls = enum_cls
+        self._members = tuple(enum_cls)
+        self._codes = {member: code for code, member in enumerate(self._members)}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self._codes[self.enum_cls(value)]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._members[value]
+
+
 # ============================================================================
 # AUTHENTICATION MODELS
 # ============================================================================
@@ -108,7 +135,7 @@ class Task(Base):
     height = Column(Integer, nullable=True)
     fps = Column(Float, nullable=True)
     status = Column(
-        Enum(TaskStatus), nullable=False, default=TaskStatus.PENDING, index=True
+        StatusCode(TaskStatus), nullable=False, default=TaskStatus.PENDING, index=True
     )
     progress = Column(Float, nullable=True, default=0.0)
     current_stage = Column(String(128), nullable=True)
@@ -150,7 +177,7 @@ class Video(Base):
 
     # Processing status
     status = Column(
-        Enum(ProcessingStatus),
+        StatusCode(ProcessingStatus),
         nullable=False,
         default=ProcessingStatus.PENDING,
         index=True,
@@ -175,6 +202,7 @@ class Video(Base):
         "Segment",
         back_populates="video",
         cascade="all, delete-orphan",
+        passive_deletes=True,
         order_by="Segment.segment_id",
     )
 
@@ -183,28 +211,6 @@ class Video(Base):
             f"<Video {self.id} - {self.title} ({self.language}) - {self.status.value}>"
         )
 
-    def to_dict(self, include_segments=False):
-        """Convert video to dictionary."""
-        result = {
-            "task_id": str(self.task_id),
-            "url": self.url,
-            "language": self.language,
-            "title": self.title,
-            "duration": self.duration,
-            "status": self.status.value,
-            "progress": self.progress,
-            "current_stage": self.current_stage,
-            "error_message": self.error_message,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "processed_at": self.processed_at.isoformat()
-            if self.processed_at
-            else None,
-            "total_segments": len(self.segments) if self.segments else 0,
-        }
-        if include_segments and self.segments:
-            result["segments"] = [seg.to_dict() for seg in self.segments]
-        return result
-
 
 class Segment(Base):
     """Segment model for video segments."""
@@ -231,32 +237,18 @@ class Segment(Base):
     # Relationships
     video = relationship("Video", back_populates="segments")
     quizzes = relationship(
-        "Quiz", back_populates="segment", cascade="all, delete-orphan"
+        "Quiz",
+        back_populates="segment",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
-    answers = relationship("UserAnswer", back_populates="segment")
+    answers = relationship("UserAnswer", back_populates="segment", passive_deletes=True)
 
     def __repr__(self):
         return (
             f"<Segment {self.id} - Video {self.video_id} - Segment #{self.segment_id}>"
         )
 
-    def to_dict(self, include_quizzes=True):
-        """Convert segment to dictionary."""
-        result = {
-            "id": self.id,
-            "segment_id": self.segment_id,
-            "start_time": self.start_time,
-            "end_time": self.end_time,
-            "topic_title": self.topic_title,
-            "short_summary": self.short_summary,
-            "keywords": self.keywords,
-        }
-        if include_quizzes:
-            result["quizzes"] = (
-                [quiz.to_dict() for quiz in self.quizzes] if self.quizzes else []
-            )
-        return result
-
 
 class Quiz(Base):
     """Quiz model for questions."""
@@ -282,26 +274,15 @@ class Quiz(Base):
     # Relationships
     segment = relationship("Segment", back_populates="quizzes")
     answers = relationship(
-        "UserAnswer", back_populates="quiz", cascade="all, delete-orphan"
+        "UserAnswer",
+        back_populates="quiz",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __repr__(self):
         return f"<Quiz {self.id} - Segment {self.segment_id}>"
 
-    def to_dict(self, include_correct=False):
-        """Convert quiz to dictionary."""
-        result = {
-            "id": self.id,
-            "question": self.question,
-            "options": self.options,
-            "type": "multiple_choice",
-        }
-        if include_correct:
-            result["correct_index"] = self.correct_index
-            if self.explanation:
-                result["explanation"] = self.explanation
-        return result
-
 
 class UserAnswer(Base):
     """User answer model for tracking quiz responses."""
@@ -19,14 +19,26 @@ Base = declarative_base()
 # Database URL
 DATABASE_URL = settings.DATABASE_URL
 
-# Create async engine
+# asyncpg connection options: JIT startup costs more than it saves on short
+# OLTP queries, and application_name makes sessions visible in pg_stat_activity
+ASYNCPG_CONNECT_ARGS = {
+    "server_settings": {"application_name": "vier-api", "jit": "off"},
+    "command_timeout": 30,
+}
+
+# Create async engine. pool_recycle retires connections before cloud NAT idle
+# timeouts kill them, which makes a pre-ping SELECT 1 per checkout redundant.
 engine = create_async_engine(
     DATABASE_URL,
     echo=settings.DEBUG,
     future=True,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    pool_pre_ping=False,
+    # Sized for concurrent pipelines plus the progress stream consumer
+    pool_size=20,
+    max_overflow=30,
+    pool_recycle=1800,
+    pool_timeout=10,
+    connect_args=ASYNCPG_CONNECT_ARGS,
 )
 
 # Create async session factory
@@ -38,13 +50,38 @@ AsyncSessionLocal = async_sessionmaker(
     autoflush=False,
 )
 
+# Read-only engine: AUTOCOMMIT skips BEGIN/COMMIT around each SELECT and a
+# separate pool keeps write traffic from starving reads. Points at a replica
+# when READ_DATABASE_URL is set, otherwise at the primary.
+read_engine = create_async_engine(
+    settings.READ_DATABASE_URL or DATABASE_URL,
+    echo=settings.DEBUG,
+    future=True,
+    isolation_level="AUTOCOMMIT",
+    pool_pre_ping=False,
+    pool_size=20,
+    pool_recycle=1800,
+    pool_timeout=10,
+    connect_args=ASYNCPG_CONNECT_ARGS,
+)
+
+AsyncReadSessionLocal = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency for getting async database sessions."""
+    """Dependency for getting async database sessions.
+
+    The session is not committed on exit; handlers that write must commit
+    explicitly so read-only requests skip the extra COMMIT round-trip.
+    """
     async with AsyncSessionLocal() as session:
         try:
             yield session
-            await session.commit()
         except Exception as e:
             await session.rollback()
             logger.error(f"Database session error: {e}")
@@ -53,6 +90,15 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency for read-only async database sessions."""
+    async with AsyncReadSessionLocal() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
 # Redis connection pool
 redis_pool = None
 
@@ -91,4 +137,5 @@ async def init_db():
 async def close_db():
     """Close database connections."""
     await engine.dispose()
+    await read_engine.dispose()
     logger.info("Database connections closed")
@@ -1,3 +1,5 @@
+import asyncio
+import ctypes
 import logging
 import sys
 from contextlib import asynccontextmanager
@@ -7,7 +9,9 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import router
 from app.core.config import settings
+from app.core.middleware import JSONGZipMiddleware
 from app.db import close_db, close_redis, init_db
+from app.services.db_updater import DBUpdater
 from app.services.storage_service import storage_service
 
 # Configure logging
@@ -59,23 +63,43 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize S3 storage: {e}")
         logger.warning("Falling back to local file storage")
 
-    # Check CUDA availability
-    import torch
-
-    if torch.cuda.is_available():
-        logger.info(f"CUDA available: {torch.cuda.get_device_name(0)}")
-        logger.info(
-            f"CUDA memory: {torch.cuda.get_device_properties(0).total_memory / 1e9:.2f} GB"
-        )
-    else:
+    # Check CUDA availability via the driver library; importing torch here
+    # would pull the whole CUDA runtime into API-only processes
+    try:
+        ctypes.CDLL("libcuda.so.1")
+        logger.info("CUDA driver present")
+    except OSError:
         logger.warning("CUDA not available - models will run on CPU (slow!)")
 
+    if settings.WORKER_ROLE == "pipeline":
+        import torch
+
+        if torch.cuda.is_available():
+            logger.info(f"CUDA available: {torch.cuda.get_device_name(0)}")
+            logger.info(
+                f"CUDA memory: {torch.cuda.get_device_properties(0).total_memory / 1e9:.2f} GB"
+            )
+
+    # Run new tasks eagerly up to their first suspension so short-lived
+    # coroutines (debounced progress, cache hits) finish without scheduling
+    if sys.version_info >= (3, 12):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+
+    # Write streamed pipeline progress to the database
+    progress_consumer = asyncio.create_task(DBUpdater.run_consumer())
+
     yield
 
     # Shutdown
     logger.info("Shutting down API")
     logger.info("Cleaning up resources...")
 
+    progress_consumer.cancel()
+    try:
+        await progress_consumer
+    except (asyncio.CancelledError, Exception):
+        pass
+
     # Close database connections
     try:
         await close_db()
@@ -113,6 +137,10 @@ app.add_middleware(
     expose_headers=["Accept-Ranges", "Content-Range", "Content-Length", "Content-Type"],
 )
 
+# Compress JSON payloads (segment lists are tens to hundreds of KB); media
+# responses are left alone
+app.add_middleware(JSONGZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Include routers
 app.include_router(router)
 
@@ -142,5 +170,8 @@ if __name__ == "__main__":
         host=settings.HOST,
         port=settings.PORT,
         reload=settings.DEBUG,
+        workers=None if settings.DEBUG else settings.WORKERS,
+        loop="uvloop",
+        http="httptools",
         log_level="info" if not settings.DEBUG else "debug",
     )
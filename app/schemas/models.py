@@ -1,11 +1,38 @@
+import sys
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Sequence
 
-from pydantic import BaseModel, Field, HttpUrl
+import numpy as np
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    PrivateAttr,
+    TypeAdapter,
+    field_validator,
+    model_serializer,
+    model_validator,
+)
+from pydantic.dataclasses import dataclass as pyd_dataclass
 
+from app.schemas.video import intern_keywords
 
-class TaskStatus(str, Enum):
+if sys.version_info >= (3, 11):
+    from enum import StrEnum
+else:
+
+    class StrEnum(str, Enum):
+        """Backport of enum.StrEnum for Python 3.10"""
+
+        def __str__(self) -> str:
+            return str(self.value)
+
+
+class TaskStatus(StrEnum):
     """Status of video processing task"""
 
     PENDING = "pending"
@@ -19,7 +46,7 @@ class TaskStatus(str, Enum):
     FAILED = "failed"
 
 
-class ProcessingStage(str, Enum):
+class ProcessingStage(StrEnum):
     """Current stage of processing"""
 
     DOWNLOAD = "download"
@@ -31,7 +58,7 @@ class ProcessingStage(str, Enum):
     FINALIZATION = "finalization"
 
 
-class QuizType(str, Enum):
+class QuizType(StrEnum):
     """Type of quiz question"""
 
     MULTIPLE_CHOICE = "multiple_choice"
@@ -39,24 +66,31 @@ class QuizType(str, Enum):
     SHORT_ANSWER = "short_answer"
 
 
-# Request models
-class VideoUploadResponse(BaseModel):
-    """Response after video upload"""
-
-    task_id: str = Field(..., description="Unique task identifier")
-    status: TaskStatus = Field(default=TaskStatus.PENDING)
-    message: str = Field(..., description="Status message")
+# Value -> member lookups so validators resolve enums with one dict hit
+_TASK_STATUS_MAP = {member.value: member for member in TaskStatus}
+_PROCESSING_STAGE_MAP = {member.value: member for member in ProcessingStage}
+_QUIZ_TYPE_MAP = {member.value: member for member in QuizType}
 
 
+# Request models
 class VideoURLRequest(BaseModel):
     """Request body for URL-based video upload"""
 
-    url: HttpUrl = Field(..., description="YouTube or direct video URL")
+    model_config = ConfigDict(defer_build=True)
+
+    # Loose sanity check only; yt-dlp does the real URL handling downstream
+    url: str = Field(
+        ...,
+        pattern=r"^https?://\S{3,2048}$",
+        description="YouTube or direct video URL",
+    )
 
 
 class VideoURLResponse(BaseModel):
     """Response after URL submission"""
 
+    model_config = ConfigDict(defer_build=True)
+
     task_id: str = Field(..., description="Unique task identifier")
     status: TaskStatus = Field(default=TaskStatus.PENDING)
 
@@ -65,6 +99,8 @@ class VideoURLResponse(BaseModel):
 class TaskStatusResponse(BaseModel):
     """Current status of a processing task"""
 
+    model_config = ConfigDict(defer_build=True)
+
     task_id: str
     status: TaskStatus
     progress: float = Field(
@@ -76,11 +112,32 @@ class TaskStatusResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+    @field_validator("status", mode="before")
+    @classmethod
+    def _coerce_status(cls, v: Any) -> Any:
+        return _TASK_STATUS_MAP.get(v, v) if isinstance(v, str) else v
+
+
+class _LanguageSlots(BaseModel):
+    """Fixed ru/en/kk translation slots; absent languages are omitted on dump"""
+
+    model_config = ConfigDict(extra="ignore", defer_build=True)
+
+    @model_serializer(mode="wrap")
+    def _omit_missing(self, handler) -> Dict[str, Any]:
+        return {lang: tr for lang, tr in handler(self).items() if tr is not None}
+
+    def default_translation(self) -> Any:
+        """Pick the Russian translation, falling back to en, then kk"""
+        return self.ru or self.en or self.kk
+
 
 # Quiz models
 class QuizOption(BaseModel):
     """Single quiz option"""
 
+    model_config = ConfigDict(defer_build=True)
+
     text: str
     is_correct: bool = False
 
@@ -88,6 +145,8 @@ class QuizOption(BaseModel):
 class QuizTranslation(BaseModel):
     """Translation for a single language"""
 
+    model_config = ConfigDict(defer_build=True)
+
     question: str = Field(..., description="Quiz question text")
     options: Optional[List[str]] = Field(
         None, description="Answer options for multiple choice"
@@ -103,10 +162,18 @@ class QuizTranslation(BaseModel):
     )
 
 
+class QuizTranslations(_LanguageSlots):
+    """Quiz translations for the supported languages"""
+
+    ru: Optional[QuizTranslation] = None
+    en: Optional[QuizTranslation] = None
+    kk: Optional[QuizTranslation] = None
+
+
 class Quiz(BaseModel):
     """A single quiz question with multilingual support"""
 
-    translations: Dict[str, QuizTranslation] = Field(
+    translations: QuizTranslations = Field(
         ..., description="Translations for different languages (ru, en, kk)"
     )
     correct_index: Optional[int] = Field(
@@ -114,126 +181,157 @@ class Quiz(BaseModel):
     )
     type: QuizType = Field(default=QuizType.MULTIPLE_CHOICE)
 
+    _default_tr: Optional[QuizTranslation] = PrivateAttr(default=None)
+
+    @field_validator("type", mode="before")
+    @classmethod
+    def _coerce_type(cls, v: Any) -> Any:
+        return _QUIZ_TYPE_MAP.get(v, v) if isinstance(v, str) else v
+
+    @model_validator(mode="after")
+    def _cache_default_translation(self) -> "Quiz":
+        self._default_tr = self.translations.default_translation()
+        return self
+
     # For backward compatibility, provide default language accessors
-    @property
+    @cached_property
     def question(self) -> str:
         """Get question in Russian (default language)"""
-        return self.translations.get("ru", list(self.translations.values())[0]).question
+        return self._default_tr.question
 
-    @property
+    @cached_property
     def options(self) -> List[str]:
         """Get options in Russian (default language)"""
-        options = self.translations.get(
-            "ru", list(self.translations.values())[0]
-        ).options
-        return options or []
+        return self._default_tr.options or []
 
-    @property
+    @cached_property
     def explanation(self) -> Optional[str]:
         """Get explanation in Russian (default language)"""
-        return self.translations.get(
-            "ru", list(self.translations.values())[0]
-        ).explanation
+        return self._default_tr.explanation
 
 
 # Segment models
 class SegmentTranslation(BaseModel):
     """Translation for segment text"""
 
+    model_config = ConfigDict(defer_build=True)
+
     topic_title: str = Field(..., description="Title/topic of this segment")
     short_summary: str = Field(..., description="Brief summary of segment content")
 
 
+class SegmentTranslations(_LanguageSlots):
+    """Segment text translations for the supported languages"""
+
+    ru: Optional[SegmentTranslation] = None
+    en: Optional[SegmentTranslation] = None
+    kk: Optional[SegmentTranslation] = None
+
+
+# Built once at import; shown as the VideoSegment example in the OpenAPI schema
+_VIDEO_SEGMENT_EXAMPLE: Dict[str, Any] = {
+    "start_time": 0.0,
+    "end_time": 45.5,
+    "translations": {
+        "ru": {
+            "topic_title": "Введение в нейронные сети",
+            "short_summary": "Обзор основ нейронных сетей и архитектуры",
+        },
+        "en": {
+            "topic_title": "Introduction to Neural Networks",
+            "short_summary": "Overview of neural network basics and architecture",
+        },
+        "kk": {
+            "topic_title": "Нейрондық желілерге кіріспе",
+            "short_summary": "Нейрондық желілердің негіздері мен архитектурасына шолу",
+        },
+    },
+    "keywords": ["neural networks", "deep learning", "backpropagation"],
+    "quizzes": [
+        {
+            "translations": {
+                "ru": {
+                    "question": "Какова основная цель обратного распространения?",
+                    "options": [
+                        "Прямое вычисление",
+                        "Оптимизация весов",
+                        "Предобработка данных",
+                        "Оценка модели",
+                    ],
+                    "explanation": "Обратное распространение используется для оптимизации весов",
+                },
+                "en": {
+                    "question": "What is the primary purpose of backpropagation?",
+                    "options": [
+                        "Forward pass computation",
+                        "Weight optimization",
+                        "Data preprocessing",
+                        "Model evaluation",
+                    ],
+                    "explanation": "Backpropagation is used for weight optimization",
+                },
+                "kk": {
+                    "question": "Кері тарату әдісінің негізгі мақсаты қандай?",
+                    "options": [
+                        "Тура есептеу",
+                        "Салмақты оңтайландыру",
+                        "Деректерді алдын ала өңдеу",
+                        "Модельді бағалау",
+                    ],
+                    "explanation": "Кері тарату салмақты оңтайландыру үшін қолданылады",
+                },
+            },
+            "correct_index": 1,
+            "type": "multiple_choice",
+        }
+    ],
+}
+
+
 class VideoSegment(BaseModel):
     """A semantic segment of the video with quizzes and multilingual support"""
 
+    model_config = ConfigDict(json_schema_extra={"example": _VIDEO_SEGMENT_EXAMPLE})
+
     start_time: float = Field(..., ge=0, description="Start time in seconds")
     end_time: float = Field(..., gt=0, description="End time in seconds")
-    translations: Dict[str, SegmentTranslation] = Field(
+    translations: SegmentTranslations = Field(
         ..., description="Translations for different languages (ru, en, kk)"
     )
-    keywords: List[str] = Field(
-        default_factory=list, description="Key terms from segment"
-    )
-    quizzes: List[Quiz] = Field(
-        default_factory=list, description="Generated quiz questions"
-    )
+    keywords: Sequence[str] = Field(default=(), description="Key terms from segment")
+    quizzes: Sequence[Quiz] = Field(default=(), description="Generated quiz questions")
+
+    _default_tr: Optional[SegmentTranslation] = PrivateAttr(default=None)
+
+    @field_validator("keywords", mode="after")
+    @classmethod
+    def _intern_keywords(cls, v: Sequence[str]) -> Sequence[str]:
+        return intern_keywords(v)
+
+    @model_validator(mode="after")
+    def _cache_default_translation(self) -> "VideoSegment":
+        self._default_tr = self.translations.default_translation()
+        return self
 
     # For backward compatibility
-    @property
+    @cached_property
     def topic_title(self) -> str:
         """Get topic title in Russian (default language)"""
-        return self.translations.get(
-            "ru", list(self.translations.values())[0]
-        ).topic_title
+        return self._default_tr.topic_title
 
-    @property
+    @cached_property
     def short_summary(self) -> str:
         """Get summary in Russian (default language)"""
-        return self.translations.get(
-            "ru", list(self.translations.values())[0]
-        ).short_summary
-
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "start_time": 0.0,
-                "end_time": 45.5,
-                "translations": {
-                    "ru": {
-                        "topic_title": "Введение в нейронные сети",
-                        "short_summary": "Обзор основ нейронных сетей и архитектуры",
-                    },
-                    "en": {
-                        "topic_title": "Introduction to Neural Networks",
-                        "short_summary": "Overview of neural network basics and architecture",
-                    },
-                    "kk": {
-                        "topic_title": "Нейрондық желілерге кіріспе",
-                        "short_summary": "Нейрондық желілердің негіздері мен архитектурасына шолу",
-                    },
-                },
-                "keywords": ["neural networks", "deep learning", "backpropagation"],
-                "quizzes": [
-                    {
-                        "translations": {
-                            "ru": {
-                                "question": "Какова основная цель обратного распространения?",
-                                "options": [
-                                    "Прямое вычисление",
-                                    "Оптимизация весов",
-                                    "Предобработка данных",
-                                    "Оценка модели",
-                                ],
-                                "explanation": "Обратное распространение используется для оптимизации весов",
-                            },
-                            "en": {
-                                "question": "What is the primary purpose of backpropagation?",
-                                "options": [
-                                    "Forward pass computation",
-                                    "Weight optimization",
-                                    "Data preprocessing",
-                                    "Model evaluation",
-                                ],
-                                "explanation": "Backpropagation is used for weight optimization",
-                            },
-                            "kk": {
-                                "question": "Кері тарату әдісінің негізгі мақсаты қандай?",
-                                "options": [
-                                    "Тура есептеу",
-                                    "Салмақты оңтайландыру",
-                                    "Деректерді алдын ала өңдеу",
-                                    "Модельді бағалау",
-                                ],
-                                "explanation": "Кері тарату салмақты оңтайландыру үшін қолданылады",
-                            },
-                        },
-                        "correct_index": 1,
-                        "type": "multiple_choice",
-                    }
-                ],
-            }
-        }
+        return self._default_tr.short_summary
+
+
+# Built once; reused for every bulk segment dump instead of per-model .dict()
+VIDEO_SEGMENTS_ADAPTER = TypeAdapter(List[VideoSegment])
+
+
+def dump_video_segments(segments: List[VideoSegment]) -> List[Dict[str, Any]]:
+    """Serialize a list of segments to plain dicts in one pydantic-core call"""
+    return VIDEO_SEGMENTS_ADAPTER.dump_python(segments)
 
 
 class SegmentsResponse(BaseModel):
@@ -245,8 +343,10 @@ class SegmentsResponse(BaseModel):
     video_title: Optional[str] = None
 
 
-# Internal processing models
-class TranscriptionSegment(BaseModel):
+# Internal processing models. Created in the thousands per video, so they are
+# slotted frozen dataclasses: no per-instance __dict__ or fields-set tracking.
+@pyd_dataclass(frozen=True, slots=True, config=ConfigDict(defer_build=True))
+class TranscriptionSegment:
     """Individual transcription segment from ASR"""
 
     start: float
@@ -255,18 +355,105 @@ class TranscriptionSegment(BaseModel):
     confidence: Optional[float] = None
 
 
-class FrameAnalysis(BaseModel):
+@dataclass(frozen=True)
+class TranscriptionColumns:
+    """Column-wise (struct-of-arrays) view of a transcription for range queries"""
+
+    starts: np.ndarray
+    ends: np.ndarray
+    texts: List[str]
+    confidences: np.ndarray
+
+    @classmethod
+    def from_segments(
+        cls, segments: List[TranscriptionSegment]
+    ) -> "TranscriptionColumns":
+        """Build columns from ASR segments, sorted by start time for range queries"""
+        starts = np.fromiter((s.start for s in segments), np.float32, len(segments))
+        if len(starts) > 1 and (np.diff(starts) < 0).any():
+            order = np.argsort(starts, kind="stable")
+            segments = [segments[i] for i in order.tolist()]
+            starts = starts[order]
+        return cls(
+            starts=starts,
+            ends=np.fromiter((s.end for s in segments), np.float32, len(segments)),
+            texts=[s.text for s in segments],
+            confidences=np.fromiter(
+                (np.nan if s.confidence is None else s.confidence for s in segments),
+                np.float32,
+                len(segments),
+            ),
+        )
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def to_segments(self) -> List[TranscriptionSegment]:
+        """Materialize TranscriptionSegment objects, e.g. for serialization"""
+        return [
+            TranscriptionSegment(
+                start=float(start),
+                end=float(end),
+                text=text,
+                confidence=None if np.isnan(conf) else float(conf),
+            )
+            for start, end, text, conf in zip(
+                self.starts, self.ends, self.texts, self.confidences
+            )
+        ]
+
+    def text_between(self, start_time: float, end_time: float) -> str:
+        """Join text of segments overlapping [start_time, end_time]"""
+        # Running max of end times keeps the left bound valid even if ASR
+        # segments overlap; everything before `lo` ends before start_time.
+        lo = int(np.searchsorted(self._max_ends, start_time, side="left"))
+        hi = int(np.searchsorted(self.starts, end_time, side="right"))
+        if lo >= hi:
+            return ""
+        keep = self.ends[lo:hi] >= start_time
+        return " ".join(
+            text for text, ok in zip(self.texts[lo:hi], keep.tolist()) if ok
+        )
+
+    def texts_between(
+        self, start_times: Sequence[float], end_times: Sequence[float]
+    ) -> List[str]:
+        """text_between for many ranges, with one searchsorted per bound array"""
+        los = np.searchsorted(self._max_ends, start_times, side="left").tolist()
+        his = np.searchsorted(self.starts, end_times, side="right").tolist()
+        texts = []
+        for start_time, lo, hi in zip(start_times, los, his):
+            if lo >= hi:
+                texts.append("")
+                continue
+            keep = self.ends[lo:hi] >= start_time
+            texts.append(
+                " ".join(
+                    text for text, ok in zip(self.texts[lo:hi], keep.tolist()) if ok
+                )
+            )
+        return texts
+
+    @cached_property
+    def _max_ends(self) -> np.ndarray:
+        return np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+
+
+@pyd_dataclass(frozen=True, slots=True, config=ConfigDict(defer_build=True))
+class FrameAnalysis:
     """Analysis result for a video frame"""
 
     timestamp: float
     description: str
-    key_elements: List[str] = Field(default_factory=list)
+    key_elements: Sequence[str] = ()
     frame_path: Optional[str] = None
 
 
 class VideoMetadata(BaseModel):
     """Metadata about the video"""
 
+    model_config = ConfigDict(defer_build=True)
+
     duration: float
     fps: float
     width: int
@@ -279,6 +466,8 @@ class VideoMetadata(BaseModel):
 class ProcessingTask(BaseModel):
     """Internal task tracking model"""
 
+    model_config = ConfigDict(use_enum_values=True, defer_build=True)
+
     task_id: str
     status: TaskStatus
     progress: float = 0.0
@@ -290,17 +479,27 @@ class ProcessingTask(BaseModel):
     frame_analyses: List[FrameAnalysis] = Field(default_factory=list)
     segments: List[VideoSegment] = Field(default_factory=list)
     error: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    # Unix epoch seconds; converted to datetime only at the API boundary
+    created_at: float = Field(default_factory=time.time)
+    updated_at: float = Field(default_factory=time.time)
+
+    @field_validator("status", mode="before")
+    @classmethod
+    def _coerce_status(cls, v: Any) -> Any:
+        return _TASK_STATUS_MAP.get(v, v) if isinstance(v, str) else v
 
-    class Config:
-        use_enum_values = True
+    @field_validator("current_stage", mode="before")
+    @classmethod
+    def _coerce_stage(cls, v: Any) -> Any:
+        return _PROCESSING_STAGE_MAP.get(v, v) if isinstance(v, str) else v
 
 
 # Error response
 class ErrorResponse(BaseModel):
     """Error response model"""
 
+    model_config = ConfigDict(defer_build=True)
+
     error: str
     detail: Optional[str] = None
     task_id: Optional[str] = None
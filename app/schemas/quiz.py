@@ -3,12 +3,14 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class QuizAnswerRequest(BaseModel):
     """Schema for submitting a quiz answer."""
 
+    model_config = ConfigDict(defer_build=True)
+
     selected_index: int = Field(
         ..., ge=0, description="Index of selected option (0-based)"
     )
@@ -17,6 +19,8 @@ class QuizAnswerRequest(BaseModel):
 class QuizAnswerResponse(BaseModel):
     """Schema for quiz answer response."""
 
+    model_config = ConfigDict(defer_build=True)
+
     is_correct: bool = Field(..., description="Whether the answer was correct")
     correct_index: int = Field(..., description="Index of the correct answer")
     explanation: Optional[str] = Field(None, description="Explanation if available")
@@ -28,6 +32,8 @@ class QuizAnswerResponse(BaseModel):
 class UserStatsUpdate(BaseModel):
     """Schema for updated user statistics."""
 
+    model_config = ConfigDict(defer_build=True)
+
     total_answered: int = Field(..., description="Total questions answered")
     total_correct: int = Field(..., description="Total correct answers")
     accuracy: float = Field(..., description="Overall accuracy percentage")
@@ -36,12 +42,16 @@ class UserStatsUpdate(BaseModel):
 class QuizRetakeRequest(BaseModel):
     """Schema for retaking a quiz segment."""
 
+    model_config = ConfigDict(defer_build=True)
+
     segment_id: int = Field(..., description="Segment ID to retake")
 
 
 class QuizReviewResponse(BaseModel):
     """Schema for reviewing answered quizzes."""
 
+    model_config = ConfigDict(defer_build=True)
+
     quiz_id: int = Field(..., description="Quiz ID")
     question: str = Field(..., description="Question text")
     options: list[str] = Field(..., description="Answer options")
@@ -55,6 +65,8 @@ class QuizReviewResponse(BaseModel):
 class SegmentAnswerStatus(BaseModel):
     """Schema for segment answer status."""
 
+    model_config = ConfigDict(defer_build=True)
+
     segment_id: int = Field(..., description="Segment ID")
     total_questions: int = Field(..., description="Total questions in segment")
     answered_questions: int = Field(
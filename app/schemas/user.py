@@ -1,23 +1,38 @@
-"""User-related schemas for profile, stats, history, and topics."""
+"""User-related schemas for profile, stats, history, and topics.
+
+These are response-only models built by UserStatsService from aggregate
+queries, so they are created with model_construct() and skip validation;
+the ge/le constraints document the API contract.
+"""
 
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Optional, Sequence
+
+from pydantic import BaseModel, ConfigDict, Field, computed_field, field_validator
 
-from pydantic import BaseModel, Field
+from app.schemas.video import intern_language
 
 
 class PaginationMeta(BaseModel):
     """Pagination metadata for list responses."""
 
+    model_config = ConfigDict(defer_build=True)
+
     page: int = Field(..., ge=1, description="Current page number (1-based)")
     page_size: int = Field(..., ge=1, description="Number of items per page")
     total_items: int = Field(..., ge=0, description="Total items available")
-    total_pages: int = Field(..., ge=1, description="Total number of pages")
+
+    @computed_field(description="Total number of pages")
+    @property
+    def total_pages(self) -> int:
+        return max(1, -(-self.total_items // self.page_size))
 
 
 class UserProfileResponse(BaseModel):
     """User profile with aggregate stats."""
 
+    model_config = ConfigDict(defer_build=True)
+
     user_id: int = Field(..., description="User ID")
     email: str = Field(..., description="User email")
     videos_watched: int = Field(
@@ -41,6 +56,8 @@ class UserProfileResponse(BaseModel):
 class TopicStats(BaseModel):
     """Aggregated accuracy per topic/keyword."""
 
+    model_config = ConfigDict(defer_build=True)
+
     topic: str = Field(..., description="Topic or keyword")
     total_answered: int = Field(..., ge=0, description="Questions answered for topic")
     correct_answers: int = Field(..., ge=0, description="Correct answers for topic")
@@ -52,6 +69,8 @@ class TopicStats(BaseModel):
 class RecentActivityItem(BaseModel):
     """Recent activity entry for stats panel."""
 
+    model_config = ConfigDict(defer_build=True)
+
     task_id: Optional[str] = Field(
         None, description="Task ID associated with the processed video"
     )
@@ -67,6 +86,8 @@ class RecentActivityItem(BaseModel):
 class UserStatsResponse(BaseModel):
     """Detailed user statistics."""
 
+    model_config = ConfigDict(defer_build=True)
+
     total_videos_watched: int = Field(..., ge=0, description="Total videos watched")
     total_questions_answered: int = Field(
         ..., ge=0, description="Total quiz questions answered"
@@ -77,17 +98,19 @@ class UserStatsResponse(BaseModel):
     accuracy: float = Field(
         ..., ge=0.0, le=100.0, description="Overall accuracy percentage"
     )
-    accuracy_by_topic: List[TopicStats] = Field(
-        default_factory=list, description="Accuracy breakdown by topic/keyword"
+    accuracy_by_topic: Sequence[TopicStats] = Field(
+        default=(), description="Accuracy breakdown by topic/keyword"
     )
-    recent_activity: List[RecentActivityItem] = Field(
-        default_factory=list, description="Recent activity entries"
+    recent_activity: Sequence[RecentActivityItem] = Field(
+        default=(), description="Recent activity entries"
     )
 
 
 class UserHistoryItem(BaseModel):
     """History record for a single video interaction."""
 
+    model_config = ConfigDict(defer_build=True)
+
     task_id: Optional[str] = Field(
         None, description="Task ID associated with the processed video"
     )
@@ -105,12 +128,19 @@ class UserHistoryItem(BaseModel):
         None, description="Processing status of the video, if applicable"
     )
 
+    @field_validator("language", mode="before")
+    @classmethod
+    def _intern_language(cls, v: Any) -> Any:
+        return intern_language(v)
+
 
 class UserHistoryResponse(BaseModel):
     """Paginated user history response."""
 
-    items: List[UserHistoryItem] = Field(
-        default_factory=list, description="List of history items"
+    model_config = ConfigDict(defer_build=True)
+
+    items: Sequence[UserHistoryItem] = Field(
+        default=(), description="List of history items"
     )
     pagination: PaginationMeta = Field(..., description="Pagination metadata")
 
@@ -118,6 +148,8 @@ class UserHistoryResponse(BaseModel):
 class UserTopicsResponse(BaseModel):
     """Top topics/keywords aggregated for the user."""
 
-    topics: List[TopicStats] = Field(
-        default_factory=list, description="Aggregated topic statistics"
+    model_config = ConfigDict(defer_build=True)
+
+    topics: Sequence[TopicStats] = Field(
+        default=(), description="Aggregated topic statistics"
     )
@@ -1,14 +1,30 @@
 """Video schemas for request/response validation."""
 
+import sys
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+# One shared object per language code, so equality checks short-circuit on id
+_LANG_INTERN = {code: sys.intern(code) for code in ("ru", "en", "kk")}
+
+
+def intern_language(value: Any) -> Any:
+    """Return the interned copy of a known language code."""
+    return _LANG_INTERN.get(value, value) if isinstance(value, str) else value
+
+
+def intern_keywords(keywords: Optional[List[str]]) -> Optional[List[str]]:
+    """Intern keyword strings; they repeat heavily across segments."""
+    return [sys.intern(keyword) for keyword in keywords] if keywords else keywords
 
 
 class VideoUploadRequest(BaseModel):
     """Schema for video upload request (URL)."""
 
+    model_config = ConfigDict(defer_build=True)
+
     url: str = Field(..., description="Video URL (YouTube, etc.)")
     language: str = Field(
         default="en",
@@ -16,11 +32,19 @@ class VideoUploadRequest(BaseModel):
         pattern="^(en|ru|kk)$",
     )
 
+    @field_validator("language", mode="before")
+    @classmethod
+    def _intern_language(cls, v: Any) -> Any:
+        return intern_language(v)
+
 
 class VideoUploadResponse(BaseModel):
     """Schema for video upload response."""
 
+    model_config = ConfigDict(defer_build=True)
+
     task_id: str = Field(..., description="Task ID for tracking processing")
+    status: str = Field(default="pending", description="Processing status")
     cached: bool = Field(
         default=False, description="Whether video was already processed"
     )
@@ -30,6 +54,8 @@ class VideoUploadResponse(BaseModel):
 class VideoCheckRequest(BaseModel):
     """Schema for checking if video is already processed."""
 
+    model_config = ConfigDict(defer_build=True)
+
     url: str = Field(..., description="Video URL to check")
     language: str = Field(
         default="en",
@@ -37,10 +63,17 @@ class VideoCheckRequest(BaseModel):
         pattern="^(en|ru|kk)$",
     )
 
+    @field_validator("language", mode="before")
+    @classmethod
+    def _intern_language(cls, v: Any) -> Any:
+        return intern_language(v)
+
 
 class VideoCheckResponse(BaseModel):
     """Schema for video check response."""
 
+    model_config = ConfigDict(defer_build=True)
+
     exists: bool = Field(..., description="Whether video exists in database")
     task_id: Optional[str] = Field(None, description="Task ID if video exists")
 
@@ -48,6 +81,8 @@ class VideoCheckResponse(BaseModel):
 class QuizSchema(BaseModel):
     """Schema for a single quiz question."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: int = Field(..., description="Quiz ID")
     question: str = Field(..., description="Question text")
     options: List[str] = Field(..., description="Answer options")
@@ -59,10 +94,26 @@ class QuizSchema(BaseModel):
         None, description="Explanation for correct answer"
     )
 
+    @classmethod
+    def from_db(cls, quiz: Any, include_correct: bool = False) -> "QuizSchema":
+        """Build from a Quiz row without re-validating ORM-guaranteed fields."""
+        data = {
+            "id": quiz.id,
+            "question": quiz.question,
+            "options": quiz.options,
+            "type": "multiple_choice",
+        }
+        if include_correct:
+            data["correct_index"] = quiz.correct_index
+            data["explanation"] = quiz.explanation
+        return cls.model_construct(**data)
+
 
 class SegmentSchema(BaseModel):
     """Schema for video segment with quizzes."""
 
+    model_config = ConfigDict(from_attributes=True)
+
     id: int = Field(..., description="Database ID for the segment")
     segment_id: int = Field(..., description="Sequential segment number")
     start_time: int = Field(..., description="Start time in seconds")
@@ -70,9 +121,24 @@ class SegmentSchema(BaseModel):
     topic_title: Optional[str] = Field(None, description="Segment topic/title")
     short_summary: Optional[str] = Field(None, description="Brief summary of segment")
     keywords: Optional[List[str]] = Field(None, description="Key topics covered")
-    quizzes: List[QuizSchema] = Field(
-        default_factory=list, description="Quiz questions"
-    )
+    quizzes: Sequence[QuizSchema] = Field(default=(), description="Quiz questions")
+
+    @classmethod
+    def from_db(cls, segment: Any, include_correct: bool = False) -> "SegmentSchema":
+        """Build from a Segment row with its (eagerly loaded) quizzes."""
+        return cls.model_construct(
+            id=segment.id,
+            segment_id=segment.segment_id,
+            start_time=segment.start_time,
+            end_time=segment.end_time,
+            topic_title=segment.topic_title,
+            short_summary=segment.short_summary,
+            keywords=intern_keywords(segment.keywords),
+            quizzes=[
+                QuizSchema.from_db(quiz, include_correct=include_correct)
+                for quiz in segment.quizzes or []
+            ],
+        )
 
 
 class SegmentsResponse(BaseModel):
@@ -81,8 +147,8 @@ class SegmentsResponse(BaseModel):
     task_id: str = Field(..., description="Task ID")
     status: str = Field(..., description="Processing status")
     total_segments: Optional[int] = Field(None, description="Total number of segments")
-    segments: List[SegmentSchema] = Field(
-        default_factory=list, description="Available segments"
+    segments: Sequence[SegmentSchema] = Field(
+        default=(), description="Available segments"
     )
 
 
@@ -92,6 +158,8 @@ class SegmentsResponse(BaseModel):
 class WSConnectedEvent(BaseModel):
     """WebSocket connected event."""
 
+    model_config = ConfigDict(defer_build=True, extra="ignore")
+
     event: str = Field(default="connected", description="Event type")
     task_id: str = Field(..., description="Task ID")
     message: str = Field(default="WebSocket connection established")
@@ -100,6 +168,8 @@ class WSConnectedEvent(BaseModel):
 class WSSegmentReadyEvent(BaseModel):
     """WebSocket segment ready event."""
 
+    model_config = ConfigDict(defer_build=True, extra="ignore")
+
     event: str = Field(default="segment_ready", description="Event type")
     segment: SegmentSchema = Field(..., description="Ready segment with quizzes")
 
@@ -107,6 +177,8 @@ class WSSegmentReadyEvent(BaseModel):
 class WSProgressEvent(BaseModel):
     """WebSocket progress event."""
 
+    model_config = ConfigDict(defer_build=True, extra="ignore")
+
     event: str = Field(default="progress", description="Event type")
     progress: float = Field(..., description="Progress percentage (0-100)")
     current_stage: str = Field(..., description="Current processing stage")
@@ -115,6 +187,8 @@ class WSProgressEvent(BaseModel):
 class WSCompletedEvent(BaseModel):
     """WebSocket completed event."""
 
+    model_config = ConfigDict(defer_build=True, extra="ignore")
+
     event: str = Field(default="completed", description="Event type")
     total_segments: int = Field(..., description="Total segments processed")
     message: str = Field(default="Video processing completed")
@@ -123,6 +197,8 @@ class WSCompletedEvent(BaseModel):
 class WSErrorEvent(BaseModel):
     """WebSocket error event."""
 
+    model_config = ConfigDict(defer_build=True, extra="ignore")
+
     event: str = Field(default="error", description="Event type")
     message: str = Field(..., description="Error message")
-    code: Optional[str] = Field(None, description="Error code")
+    code: str = Field(default="", description="Error code (empty if none)")
@@ -6,35 +6,37 @@ Contains:
 - VisionService: Frame analysis using Qwen2-VL
 - LLMService: Quiz generation and segmentation using Llama
 - AuthService: Authentication and JWT token management
+
+Exports are resolved lazily (PEP 562) so importing one service does not pull
+in the ML stacks of the others. The auth_service singleton is not re-exported
+here because the package attribute of that name is the submodule; import it
+from app.services.auth_service.
 """
 
-from app.services.asr_service import ASRService
-from app.services.auth_service import AuthService, auth_service
-from app.services.llm_service import LLMService
-from app.services.vision_service import VisionService
+import importlib
+
+_EXPORTS = {
+    "ASRService": "asr_service",
+    "VisionService": "vision_service",
+    "LLMService": "llm_service",
+    "AuthService": "auth_service",
+    "VideoPipeline": "pipeline",
+    "create_task": "pipeline",
+    "get_task": "pipeline",
+    "get_task_status": "pipeline",
+    "get_task_segments": "pipeline",
+    "process_video_from_file": "pipeline",
+    "process_video_from_url": "pipeline",
+}
+
+__all__ = list(_EXPORTS)
 
-# TODO: Update pipeline to use new Video model
-# from app.services.pipeline import (
-#     VideoPipeline,
-#     create_task,
-#     get_task,
-#     get_task_segments,
-#     get_task_status,
-#     process_video_from_file,
-#     process_video_from_url,
-# )
 
-__all__ = [
-    "ASRService",
-    "VisionService",
-    "LLMService",
-    "AuthService",
-    "auth_service",
-    # "VideoPipeline",
-    # "create_task",
-    # "get_task",
-    # "get_task_status",
-    # "get_task_segments",
-    # "process_video_from_file",
-    # "process_video_from_url",
-]
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"app.services.{module_name}")
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
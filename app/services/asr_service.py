@@ -1,12 +1,14 @@
+import asyncio
 import logging
 import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional, Union
 
-from faster_whisper import WhisperModel
+import numpy as np
+from faster_whisper import BatchedInferencePipeline, WhisperModel
 
 from app.core.config import settings
-from app.schemas.models import TranscriptionSegment
+from app.schemas.models import TranscriptionColumns, TranscriptionSegment
 from app.utils.video_utils import clear_vram, get_vram_usage
 
 logger = logging.getLogger(__name__)
@@ -17,7 +19,10 @@ class ASRService:
 
     def __init__(self):
         self.model: Optional[WhisperModel] = None
+        self.batched_model: Optional[BatchedInferencePipeline] = None
         self.model_loaded = False
+        # faster-whisper models are not safe for concurrent transcribe calls
+        self._lock = asyncio.Lock()
 
     def load_model(self):
         """Load Whisper model with memory optimization"""
@@ -39,14 +44,25 @@ class ASRService:
             # Use the model specified in settings
             model_name = settings.WHISPER_MODEL
 
+            # FP16 activations need a GPU; CTranslate2 quantizes weights on load
+            compute_type = settings.WHISPER_COMPUTE_TYPE
+            if settings.WHISPER_DEVICE == "cpu" and "float16" in compute_type:
+                compute_type = "int8"
+
             self.model = WhisperModel(
                 model_name,
                 device=settings.WHISPER_DEVICE,
-                compute_type=settings.WHISPER_COMPUTE_TYPE,
+                compute_type=compute_type,
                 download_root=str(settings.MODELS_DIR / "whisper"),
             )
+            # WhisperModel.transcribe has no batch_size; batched decoding of
+            # VAD chunks needs the pipeline wrapper
+            if settings.WHISPER_BATCH_SIZE > 1:
+                self.batched_model = BatchedInferencePipeline(model=self.model)
 
             self.model_loaded = True
+            if settings.WHISPER_DEVICE == "cuda":
+                self._warm_up()
             allocated, reserved = get_vram_usage()
             logger.info("Whisper model loaded successfully")
             logger.info(
@@ -58,9 +74,25 @@ class ASRService:
             self.model_loaded = False
             raise Exception(f"ASR model loading failed: {str(e)}")
 
+    def _warm_up(self):
+        """Decode one second of silence so CUDA setup and kernel selection
+        are paid at load time rather than by the first request
+        """
+        try:
+            segments, _ = self.model.transcribe(
+                np.zeros(16000, dtype=np.float32),
+                language="en",
+                beam_size=settings.WHISPER_BEAM_SIZE,
+            )
+            list(segments)
+            logger.info("Whisper warm-up completed")
+        except Exception as e:
+            logger.warning(f"Whisper warm-up failed: {e}")
+
     def unload_model(self):
         """Unload model and free VRAM"""
         if self.model is not None:
+            self.batched_model = None
             del self.model
             self.model = None
             self.model_loaded = False
@@ -71,6 +103,15 @@ class ASRService:
 
             logger.info("Whisper model unloaded")
 
+    async def unload_async(self):
+        """Unload the model once no transcription holds it
+
+        The service is shared by all pipelines, so unloading takes the same
+        lock as transcribe_async instead of pulling the model from under it.
+        """
+        async with self._lock:
+            await asyncio.to_thread(self.unload_model)
+
     def transcribe(
         self, audio_path: Path, language: Optional[str] = None, task: str = "transcribe"
     ) -> List[TranscriptionSegment]:
@@ -85,6 +126,35 @@ class ASRService:
         Returns:
             List of TranscriptionSegment objects with timestamps
 
+        Raises:
+            Exception: If transcription fails
+        """
+        return list(self.transcribe_stream(audio_path, language=language, task=task))
+
+    async def transcribe_async(
+        self, audio_path: Path, language: Optional[str] = None, task: str = "transcribe"
+    ) -> List[TranscriptionSegment]:
+        """Transcribe in a worker thread, one transcription at a time per model"""
+        async with self._lock:
+            return await asyncio.to_thread(self.transcribe, audio_path, language, task)
+
+    def transcribe_stream(
+        self, audio_path: Path, language: Optional[str] = None, task: str = "transcribe"
+    ) -> Iterator[TranscriptionSegment]:
+        """
+        Transcribe audio file to text, yielding segments as they are decoded
+
+        faster-whisper decodes lazily, so consumers can process each segment
+        while the rest of the audio is still being transcribed.
+
+        Args:
+            audio_path: Path to audio file
+            language: Language code (e.g., 'en', 'es'). Auto-detect if None
+            task: 'transcribe' or 'translate' (to English)
+
+        Yields:
+            TranscriptionSegment objects with timestamps
+
         Raises:
             Exception: If transcription fails
         """
@@ -102,14 +172,17 @@ class ASRService:
             logger.info(f"Language: {language or 'auto-detect'}, Task: {task}")
             logger.info(f"Batch size: {settings.WHISPER_BATCH_SIZE}")
 
-            # Transcribe with faster-whisper (with batching)
-            # Note: batch_size parameter requires faster-whisper >= 0.9.0
             transcribe_kwargs = {
                 "language": language,
                 "task": task,
-                "beam_size": 5,
-                "best_of": 5,
+                "beam_size": settings.WHISPER_BEAM_SIZE,
+                "best_of": settings.WHISPER_BEAM_SIZE,
+                "patience": 1.0,  # Stop beam search once a finished hypothesis wins
                 "temperature": 0.0,
+                # Decode chunks independently so they can be batched
+                "condition_on_previous_text": False,
+                "no_speech_threshold": 0.6,
+                "compression_ratio_threshold": 2.4,
                 "vad_filter": True,
                 "vad_parameters": {
                     "min_silence_duration_ms": 500,
@@ -117,29 +190,20 @@ class ASRService:
                 },
             }
 
-            # Try with batch_size first (newer versions of faster-whisper)
-            if (
-                hasattr(settings, "WHISPER_BATCH_SIZE")
-                and settings.WHISPER_BATCH_SIZE > 1
-            ):
-                transcribe_kwargs["batch_size"] = settings.WHISPER_BATCH_SIZE
-
-            try:
+            # Batched pipeline decodes VAD chunks in parallel on the GPU; VAD
+            # merges speech into windows of at most chunk_length seconds, cut
+            # at silences, so each encoder pass gets a full 30 s window
+            if self.batched_model is not None:
+                segments, info = self.batched_model.transcribe(
+                    str(audio_path),
+                    batch_size=settings.WHISPER_BATCH_SIZE,
+                    chunk_length=30,
+                    **transcribe_kwargs,
+                )
+            else:
                 segments, info = self.model.transcribe(
                     str(audio_path), **transcribe_kwargs
                 )
-            except TypeError as e:
-                if "batch_size" in str(e):
-                    # batch_size not supported, retry without it
-                    logger.warning(
-                        "batch_size parameter not supported in this version of faster-whisper, retrying without it"
-                    )
-                    transcribe_kwargs.pop("batch_size", None)
-                    segments, info = self.model.transcribe(
-                        str(audio_path), **transcribe_kwargs
-                    )
-                else:
-                    raise
 
             # Log detected language
             logger.info(
@@ -147,41 +211,34 @@ class ASRService:
             )
 
             # Convert to TranscriptionSegment objects
-            transcription_segments = []
-            total_text = ""
+            segment_count = 0
+            total_chars = 0
 
             for segment in segments:
+                text = segment.text.strip()
                 trans_segment = TranscriptionSegment(
                     start=segment.start,
                     end=segment.end,
-                    text=segment.text.strip(),
+                    text=text,
                     confidence=segment.avg_logprob
                     if hasattr(segment, "avg_logprob")
                     else None,
                 )
-                transcription_segments.append(trans_segment)
-                total_text += segment.text.strip() + " "
+                segment_count += 1
+                total_chars += len(text) + 1
 
-                logger.debug(
-                    f"[{segment.start:.2f}s -> {segment.end:.2f}s] {segment.text.strip()}"
-                )
+                logger.debug(f"[{segment.start:.2f}s -> {segment.end:.2f}s] {text}")
+                yield trans_segment
 
             logger.info(
-                f"Transcription completed: {len(transcription_segments)} segments, "
-                f"{len(total_text)} characters"
+                f"Transcription completed: {segment_count} segments, "
+                f"{total_chars} characters"
             )
 
-            return transcription_segments
-
         except Exception as e:
             logger.error(f"Transcription failed: {e}")
             raise Exception(f"ASR transcription failed: {str(e)}")
 
-        finally:
-            # Free VRAM after transcription only if not keeping models in memory
-            if not settings.MODELS_STAY_IN_MEMORY:
-                clear_vram()
-
     def get_full_transcript(self, segments: List[TranscriptionSegment]) -> str:
         """
         Combine all segments into full transcript
@@ -195,24 +252,30 @@ class ASRService:
         return " ".join(segment.text for segment in segments)
 
     def get_transcript_for_timerange(
-        self, segments: List[TranscriptionSegment], start_time: float, end_time: float
+        self,
+        segments: Union[List[TranscriptionSegment], TranscriptionColumns],
+        start_time: float,
+        end_time: float,
     ) -> str:
         """
         Get transcript text for a specific time range
 
+        For many ranges over one transcription, pass a TranscriptionColumns
+        built once with TranscriptionColumns.from_segments; it is sorted by
+        start time and answers each range with a binary search.
+
         Args:
-            segments: List of transcription segments
+            segments: Transcription segments, or their column index
             start_time: Start time in seconds
             end_time: End time in seconds
 
         Returns:
             Transcript text within the time range
         """
-        text_parts = []
+        if not isinstance(segments, TranscriptionColumns):
+            segments = TranscriptionColumns.from_segments(segments)
+        return segments.text_between(start_time, end_time)
 
-        for segment in segments:
-            # Check if segment overlaps with time range
-            if segment.end >= start_time and segment.start <= end_time:
-                text_parts.append(segment.text)
 
-        return " ".join(text_parts)
+# Singleton instance shared by all pipelines so the model is loaded once
+asr_service = ASRService()
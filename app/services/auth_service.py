@@ -1,18 +1,29 @@
 """Authentication service for JWT tokens and password management."""
 
+import asyncio
 import secrets
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from jose import JWTError, jwt
+import bcrypt
+import jwt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from passlib.context import CryptContext
-from sqlalchemy import select
+from sqlalchemy import delete, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.db.models import RefreshToken, User
 
-# Password hashing context
+# New passwords are hashed with argon2id; bcrypt hashes are still verified and
+# rehashed on the next successful login
+password_hasher = PasswordHasher(time_cost=2, memory_cost=64 * 1024, parallelism=1)
+
+# Legacy hash verification only; bcrypt hashes go straight to the bcrypt module
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # JWT settings
@@ -25,18 +36,31 @@ ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60  # 1 hour
 REFRESH_TOKEN_EXPIRE_DAYS = 30  # 30 days
 
+# Decoded payloads keyed by raw token; the signature is checked on first decode
+# and entries are only served while their exp claim is in the future
+DECODE_CACHE_SIZE = 10_000
+_decode_cache: "OrderedDict[str, dict]" = OrderedDict()
+_decode_cache_lock = threading.Lock()
+
 
 class AuthService:
     """Service for authentication operations."""
 
     @staticmethod
     def hash_password(password: str) -> str:
-        """Hash a password using bcrypt."""
-        return pwd_context.hash(password)
+        """Hash a password using argon2id."""
+        return password_hasher.hash(password)
 
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         """Verify a password against its hash."""
+        if hashed_password.startswith("$argon2"):
+            try:
+                return password_hasher.verify(hashed_password, plain_password)
+            except (VerificationError, InvalidHashError):
+                return False
+        if hashed_password.startswith(("$2b$", "$2a$", "$2y$")):
+            return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
         return pwd_context.verify(plain_password, hashed_password)
 
     @staticmethod
@@ -45,12 +69,13 @@ class AuthService:
     ) -> str:
         """Create a JWT access token."""
         to_encode = data.copy()
+        now = int(time.time())
         if expires_delta:
-            expire = datetime.utcnow() + expires_delta
+            expire = now + int(expires_delta.total_seconds())
         else:
-            expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+            expire = now + ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
-        to_encode.update({"exp": expire, "type": "access"})
+        to_encode.update({"exp": expire, "iat": now, "type": "access"})
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
@@ -58,20 +83,34 @@ class AuthService:
     def create_refresh_token(data: dict) -> str:
         """Create a JWT refresh token."""
         to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-        to_encode.update({"exp": expire, "type": "refresh"})
+        now = int(time.time())
+        expire = now + REFRESH_TOKEN_EXPIRE_DAYS * 86400
+        to_encode.update({"exp": expire, "iat": now, "type": "refresh"})
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
     @staticmethod
     def decode_token(token: str) -> Optional[dict]:
         """Decode and verify a JWT token."""
+        with _decode_cache_lock:
+            payload = _decode_cache.get(token)
+            if payload is not None:
+                _decode_cache.move_to_end(token)
+        if payload is not None and payload.get("exp", 0) > time.time():
+            return payload
+
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            return payload
-        except JWTError:
+        except jwt.PyJWTError:
             return None
 
+        with _decode_cache_lock:
+            _decode_cache[token] = payload
+            _decode_cache.move_to_end(token)
+            if len(_decode_cache) > DECODE_CACHE_SIZE:
+                _decode_cache.popitem(last=False)
+        return payload
+
     @staticmethod
     async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
         """Get user by email address."""
@@ -87,11 +126,12 @@ class AuthService:
     @staticmethod
     async def create_user(db: AsyncSession, email: str, password: str) -> User:
         """Create a new user."""
-        hashed_password = AuthService.hash_password(password)
+        # argon2id (2 passes over 64 MiB) is CPU- and memory-bound for tens of
+        # ms; keep it off the event loop
+        hashed_password = await asyncio.to_thread(AuthService.hash_password, password)
         user = User(email=email, password_hash=hashed_password)
         db.add(user)
         await db.commit()
-        await db.refresh(user)
         return user
 
     @staticmethod
@@ -102,8 +142,16 @@ class AuthService:
         user = await AuthService.get_user_by_email(db, email)
         if not user:
             return None
-        if not AuthService.verify_password(password, user.password_hash):
+        if not await asyncio.to_thread(
+            AuthService.verify_password, password, user.password_hash
+        ):
             return None
+        if not user.password_hash.startswith("$argon2"):
+            # Migrate legacy bcrypt hashes while the plaintext is at hand
+            user.password_hash = await asyncio.to_thread(
+                AuthService.hash_password, password
+            )
+            await db.commit()
         return user
 
     @staticmethod
@@ -111,22 +159,27 @@ class AuthService:
         db: AsyncSession, user_id: int, token: str
     ) -> RefreshToken:
         """Save a refresh token to the database, ensuring uniqueness per token value."""
-        expires_at = datetime.utcnow() + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
-
-        # Remove any existing rows with the same token to avoid unique constraint violations
-        existing = await db.execute(
-            select(RefreshToken).where(RefreshToken.token == token)
+        # expires_at is a naive UTC column
+        expires_at = datetime.fromtimestamp(
+            int(time.time()) + REFRESH_TOKEN_EXPIRE_DAYS * 86400, tz=timezone.utc
+        ).replace(tzinfo=None)
+
+        # Remove any existing rows with the same token to avoid unique constraint
+        # violations, and purge expired tokens in the same statement
+        await db.execute(
+            delete(RefreshToken).where(
+                or_(
+                    RefreshToken.token == token,
+                    RefreshToken.expires_at <= func.timezone("utc", func.now()),
+                )
+            )
         )
-        existing_tokens = existing.scalars().all()
-        for row in existing_tokens:
-            await db.delete(row)
 
         refresh_token = RefreshToken(
             user_id=user_id, token=token, expires_at=expires_at
         )
         db.add(refresh_token)
         await db.commit()
-        await db.refresh(refresh_token)
         return refresh_token
 
     @staticmethod
@@ -155,23 +208,22 @@ class AuthService:
         if not payload or payload.get("type") != "refresh":
             return None
 
-        # Check if token exists in database and not expired
-        refresh_token = await AuthService.get_refresh_token(db, token)
-        if not refresh_token:
-            return None
-
-        if refresh_token.expires_at < datetime.utcnow():
-            # Token expired, delete it
-            await db.delete(refresh_token)
-            await db.commit()
-            return None
-
-        # Get user
         user_id = payload.get("sub")
         if not user_id:
             return None
 
-        return await AuthService.get_user_by_id(db, int(user_id))
+        # Token must exist and be unexpired; fetch its user in the same query.
+        # Expired rows are purged by save_refresh_token.
+        result = await db.execute(
+            select(User)
+            .join(RefreshToken, RefreshToken.user_id == User.id)
+            .where(
+                RefreshToken.token == token,
+                RefreshToken.expires_at > func.timezone("utc", func.now()),
+                User.id == int(user_id),
+            )
+        )
+        return result.scalar_one_or_none()
 
 
 # Singleton instance
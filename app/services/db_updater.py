@@ -1,12 +1,17 @@
 """Database updater utility for syncing pipeline status with database."""
 
+import asyncio
+import functools
+import json
 import logging
-from datetime import datetime
+import os
+import socket
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Dict, Optional, Tuple, Union
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, select, update
 
 from app.db.models import (
     ProcessingStatus as DBProcessingStatus,
@@ -14,6 +19,7 @@ from app.db.models import (
 from app.db.models import (
     Quiz,
     Segment,
+    Task,
     Video,
 )
 from app.db.models import (
@@ -24,6 +30,157 @@ from app.services.task_service import TaskService
 
 logger = logging.getLogger(__name__)
 
+# Pipeline status -> DB task status, and DB task status -> video status
+_STATUS_MAP = MappingProxyType(
+    {
+        "pending": DBTaskStatus.PENDING,
+        "processing": DBTaskStatus.PROCESSING,
+        "completed": DBTaskStatus.COMPLETED,
+        "failed": DBTaskStatus.FAILED,
+    }
+)
+# Timestamp columns are naive UTC; take the time from the database clock
+_UTC_NOW = func.timezone("utc", func.now())
+
+_FINISHED_TASK_STATUSES = (DBTaskStatus.COMPLETED, DBTaskStatus.FAILED)
+_FINISHED_VIDEO_STATUSES = (DBProcessingStatus.COMPLETED, DBProcessingStatus.FAILED)
+
+_VIDEO_STATUS_MAP = MappingProxyType(
+    {
+        DBTaskStatus.PENDING: DBProcessingStatus.PENDING,
+        DBTaskStatus.PROCESSING: DBProcessingStatus.PROCESSING,
+        DBTaskStatus.COMPLETED: DBProcessingStatus.COMPLETED,
+        DBTaskStatus.FAILED: DBProcessingStatus.FAILED,
+    }
+)
+
+# Stage progress is published to a Redis stream and written to the database by
+# a single consumer that keeps only the latest entry per task; terminal states
+# bypass the stream and are written immediately
+PROGRESS_STREAM = "task:updates"
+PROGRESS_CONSUMER_GROUP = "db_writer"
+PROGRESS_STREAM_MAXLEN = 10_000
+PROGRESS_FLUSH_INTERVAL = 0.5
+# Last published (stage, whole-percent progress) per task; repeats are dropped
+_last_progress: Dict[str, Tuple[str, float]] = {}
+# Serializes consumer writes with terminal writes made in this process
+_flush_lock = asyncio.Lock()
+
+# Quiz batches at least this large are written with COPY on PostgreSQL
+QUIZ_COPY_MIN_ROWS = 200
+_QUIZ_COPY_COLUMNS = (
+    "segment_id",
+    "question",
+    "options",
+    "correct_index",
+    "explanation",
+    "language",
+    "created_at",
+)
+
+_redis = None
+
+
+@functools.lru_cache(maxsize=4096)
+def _to_task_uuid(task_id: str) -> Union[UUID, str]:
+    """Parse a task id into a UUID once; non-UUID ids are passed through."""
+    if len(task_id) != 36 or task_id[8] != "-":
+        return task_id
+    try:
+        return UUID(task_id)
+    except ValueError:
+        return task_id
+
+
+async def _get_redis():
+    """Lazily create the Redis client shared by all updater calls."""
+    global _redis
+    if _redis is None:
+        _redis = await get_redis()
+    return _redis
+
+
+async def _discard_progress(task_id: str):
+    """Mark a task finished in the stream and wait out any in-flight flush."""
+    _last_progress.pop(task_id, None)
+    try:
+        redis = await _get_redis()
+        await redis.xadd(
+            PROGRESS_STREAM,
+            {"task_id": task_id, "done": "1"},
+            maxlen=PROGRESS_STREAM_MAXLEN,
+            approximate=True,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to publish final marker for task {task_id}: {e}")
+    async with _flush_lock:
+        pass
+
+
+async def _create_consumer_group(redis):
+    """Create the progress stream and its consumer group if missing."""
+    try:
+        await redis.xgroup_create(
+            PROGRESS_STREAM, PROGRESS_CONSUMER_GROUP, id="$", mkstream=True
+        )
+    except Exception as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+def _video_status_update(
+    task_uuid,
+    db_status: DBTaskStatus,
+    progress: Optional[float],
+    current_stage: Optional[str],
+    error_message: Optional[str],
+    skip_finished: bool = False,
+):
+    """Build a single UPDATE of the task's video row from the changed fields.
+
+    With skip_finished the row is left alone once it is completed or failed, so
+    progress read late from the stream cannot reopen a finished video.
+    """
+    video_status = _VIDEO_STATUS_MAP[db_status]
+    values = {"status": video_status}
+    if progress is not None:
+        values["progress"] = progress
+    if current_stage is not None:
+        values["current_stage"] = current_stage
+    if error_message:
+        values["error_message"] = error_message
+    if video_status == DBProcessingStatus.PROCESSING:
+        values["started_at"] = func.coalesce(Video.started_at, _UTC_NOW)
+    elif video_status in (DBProcessingStatus.COMPLETED, DBProcessingStatus.FAILED):
+        values["completed_at"] = _UTC_NOW
+    statement = update(Video).where(Video.task_id == task_uuid)
+    if skip_finished:
+        statement = statement.where(Video.status.notin_(_FINISHED_VIDEO_STATUSES))
+    return statement.values(**values).execution_options(synchronize_session=False)
+
+
+async def _copy_quiz_rows(db, quiz_rows: list):
+    """COPY quiz rows over the session's asyncpg connection (no commit)."""
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    # Database clock, like the status timestamps written in this transaction
+    created_at = (await db.execute(select(_UTC_NOW))).scalar_one()
+    records = [
+        (
+            row["segment_id"],
+            row["question"],
+            json.dumps(row["options"]),
+            row["correct_index"],
+            row["explanation"],
+            row["language"],
+            created_at,
+        )
+        for row in quiz_rows
+    ]
+    await raw_connection.driver_connection.copy_records_to_table(
+        Quiz.__tablename__, records=records, columns=_QUIZ_COPY_COLUMNS
+    )
+
 
 class DBUpdater:
     """Utility class for updating task status in database from pipeline."""
@@ -39,19 +196,48 @@ class DBUpdater:
         """Update task status in database."""
         try:
             async with AsyncSessionLocal() as db:
-                redis = await get_redis()
-                task_service = TaskService(db, redis)
-
-                # Map pipeline status to DB status
-                status_map = {
-                    "pending": DBTaskStatus.PENDING,
-                    "processing": DBTaskStatus.PROCESSING,
-                    "completed": DBTaskStatus.COMPLETED,
-                    "failed": DBTaskStatus.FAILED,
-                }
-
-                db_status = status_map.get(status, DBTaskStatus.PROCESSING)
+                db_status = _STATUS_MAP.get(status, DBTaskStatus.PROCESSING)
+                task_uuid = _to_task_uuid(task_id)
+
+                if db_status == DBTaskStatus.PROCESSING and not error_message:
+                    # Progress ticks: write both rows directly in one transaction,
+                    # without TaskService's SELECT/refresh or the Redis cache.
+                    # Finished rows are skipped: stream entries can be consumed
+                    # after the terminal write by this or another worker
+                    task_values = {
+                        "status": db_status,
+                        "updated_at": _UTC_NOW,
+                        "started_at": func.coalesce(Task.started_at, _UTC_NOW),
+                    }
+                    if progress is not None:
+                        task_values["progress"] = progress
+                    if current_stage is not None:
+                        task_values["current_stage"] = current_stage
+                    await db.execute(
+                        update(Task)
+                        .where(
+                            Task.id == task_uuid,
+                            Task.status.notin_(_FINISHED_TASK_STATUSES),
+                        )
+                        .values(**task_values)
+                        .execution_options(synchronize_session=False)
+                    )
+                    await db.execute(
+                        _video_status_update(
+                            task_uuid,
+                            db_status,
+                            progress,
+                            current_stage,
+                            None,
+                            skip_finished=True,
+                        )
+                    )
+                    await db.commit()
+                    logger.debug("Updated task %s progress in database", task_id)
+                    return
 
+                redis = await _get_redis()
+                task_service = TaskService(db, redis)
                 await task_service.update_task_status(
                     task_id=task_id,
                     status=db_status,
@@ -61,48 +247,20 @@ class DBUpdater:
                 )
 
                 try:
-                    task_uuid = UUID(task_id)
-                except Exception:
-                    task_uuid = task_id
-                try:
-                    video_result = await db.execute(
-                        select(Video).where(Video.task_id == task_uuid)
-                    )
-                    video = video_result.scalar_one_or_none()
-                    if video:
-                        video_status_map = {
-                            DBTaskStatus.PENDING: DBProcessingStatus.PENDING,
-                            DBTaskStatus.PROCESSING: DBProcessingStatus.PROCESSING,
-                            DBTaskStatus.COMPLETED: DBProcessingStatus.COMPLETED,
-                            DBTaskStatus.FAILED: DBProcessingStatus.FAILED,
-                        }
-                        video.status = video_status_map.get(
-                            db_status, video.status or DBProcessingStatus.PROCESSING
+                    await db.execute(
+                        _video_status_update(
+                            task_uuid, db_status, progress, current_stage, error_message
                         )
-                        if progress is not None:
-                            video.progress = progress
-                        if current_stage is not None:
-                            video.current_stage = current_stage
-                        if error_message:
-                            video.error_message = error_message
-                        if (
-                            video.status == DBProcessingStatus.PROCESSING
-                            and not video.started_at
-                        ):
-                            video.started_at = datetime.utcnow()
-                        if video.status in (
-                            DBProcessingStatus.COMPLETED,
-                            DBProcessingStatus.FAILED,
-                        ):
-                            video.completed_at = datetime.utcnow()
-                        await db.commit()
-                        await db.refresh(video)
+                    )
+                    await db.commit()
                 except Exception as e:  # noqa: BLE001
                     logger.error(
                         f"Failed to update video {task_id} status in database: {e}"
                     )
 
-                logger.debug(f"Updated task {task_id} status to {status} in database")
+                logger.debug(
+                    "Updated task %s status to %s in database", task_id, status
+                )
 
         except Exception as e:
             logger.error(f"Failed to update task {task_id} status in database: {e}")
@@ -117,7 +275,7 @@ class DBUpdater:
         """Update task results in database."""
         try:
             async with AsyncSessionLocal() as db:
-                redis = await get_redis()
+                redis = await _get_redis()
                 task_service = TaskService(db, redis)
 
                 await task_service.update_task_results(
@@ -128,112 +286,177 @@ class DBUpdater:
                 )
 
                 try:
-                    task_uuid = UUID(task_id)
-                except Exception:
-                    task_uuid = task_id
-                try:
-                    video_result = await db.execute(
-                        select(Video).where(Video.task_id == task_uuid)
-                    )
-                    video = video_result.scalar_one_or_none()
-                    if video:
-                        video.status = DBProcessingStatus.COMPLETED
-                        video.progress = 100.0
-                        video.current_stage = "Completed"
-                        if duration:
-                            video.duration = duration
-                        if video_metadata:
-                            video.width = video_metadata.get("width")
-                            video.height = video_metadata.get("height")
-                            video.fps = video_metadata.get("fps")
-                        video.completed_at = datetime.utcnow()
-
-                        # Replace existing segments/quizzes with new ones without lazy loads
-                        result = await db.execute(
-                            select(Segment).where(Segment.video_id == video.id)
-                        )
-                        existing_segments = list(result.scalars().all())
-                        for seg in existing_segments:
-                            await db.delete(seg)
-                        if existing_segments:
-                            await db.flush()
-
-                        for idx, seg in enumerate(segments or [], start=1):
-                            translations = seg.get("translations") or {}
-                            ru_tr = translations.get("ru", {})
-                            topic_title = seg.get("topic_title") or ru_tr.get(
-                                "topic_title"
-                            )
-                            short_summary = seg.get("short_summary") or ru_tr.get(
-                                "short_summary"
-                            )
-                            keywords = seg.get("keywords")
-
-                            segment_obj = Segment(
-                                video_id=video.id,
-                                segment_id=seg.get("segment_id") or idx,
-                                start_time=int(seg.get("start_time") or 0),
-                                end_time=int(seg.get("end_time") or 0),
-                                topic_title=topic_title,
-                                short_summary=short_summary,
-                                keywords=keywords,
-                            )
-
-                            quizzes = seg.get("quizzes") or []
-                            for quiz in quizzes:
-                                q_translations = quiz.get("translations") or {}
-                                ru_q = q_translations.get("ru", {})
-                                question = quiz.get("question") or ru_q.get("question")
-                                options = (
-                                    quiz.get("options") or ru_q.get("options") or []
-                                )
-                                explanation = (
-                                    quiz.get("explanation")
-                                    or ru_q.get("explanation")
-                                    or None
-                                )
-                                segment_obj.quizzes.append(
-                                    Quiz(
-                                        question=question,
-                                        options=list(options),
-                                        correct_index=int(
-                                            quiz.get("correct_index") or 0
-                                        ),
-                                        explanation=explanation,
-                                        language=quiz.get("language") or "ru",
-                                    )
-                                )
-
-                            db.add(segment_obj)
-
+                    if await DBUpdater._write_video_results(
+                        db, task_id, segments, duration
+                    ):
                         await db.commit()
-                        await db.refresh(video)
+                        await task_service.invalidate_segments_cache(task_id)
                 except Exception as e:  # noqa: BLE001
                     logger.error(
                         f"Failed to update video {task_id} results in database: {e}"
                     )
 
                 logger.info(
-                    f"Updated task {task_id} results in database: {len(segments)} segments"
+                    "Updated task %s results in database: %d segments",
+                    task_id,
+                    len(segments),
                 )
 
         except Exception as e:
             logger.error(f"Failed to update task {task_id} results in database: {e}")
 
+    @staticmethod
+    async def _write_video_results(
+        db, task_id: str, segments: list, duration: Optional[float] = None
+    ) -> bool:
+        """Mark the task's video completed and replace its segments/quizzes.
+
+        Does not commit. Returns False if no video row exists for the task.
+        """
+        values = {
+            "status": DBProcessingStatus.COMPLETED,
+            "progress": 100.0,
+            "current_stage": "Completed",
+            "completed_at": _UTC_NOW,
+        }
+        if duration:
+            values["duration"] = int(duration)
+        result = await db.execute(
+            update(Video)
+            .where(Video.task_id == _to_task_uuid(task_id))
+            .values(**values)
+            .returning(Video.id)
+            .execution_options(synchronize_session=False)
+        )
+        video_id = result.scalar_one_or_none()
+        if video_id is None:
+            return False
+
+        # Replace existing segments/quizzes with new ones using bulk statements;
+        # quizzes and answers go via ON DELETE CASCADE
+        await db.execute(delete(Segment).where(Segment.video_id == video_id))
+
+        segments = segments or []
+        segment_rows = []
+        for idx, seg in enumerate(segments, start=1):
+            translations = seg.get("translations") or {}
+            ru_tr = translations.get("ru", {})
+            segment_rows.append(
+                {
+                    "video_id": video_id,
+                    "segment_id": seg.get("segment_id") or idx,
+                    "start_time": int(seg.get("start_time") or 0),
+                    "end_time": int(seg.get("end_time") or 0),
+                    "topic_title": seg.get("topic_title") or ru_tr.get("topic_title"),
+                    "short_summary": seg.get("short_summary")
+                    or ru_tr.get("short_summary"),
+                    "keywords": seg.get("keywords"),
+                }
+            )
+
+        segment_ids = []
+        if segment_rows:
+            result = await db.execute(
+                insert(Segment).returning(Segment.id, sort_by_parameter_order=True),
+                segment_rows,
+            )
+            segment_ids = result.scalars().all()
+
+        quiz_rows = []
+        for segment_pk, seg in zip(segment_ids, segments):
+            for quiz in seg.get("quizzes") or []:
+                q_translations = quiz.get("translations") or {}
+                ru_q = q_translations.get("ru", {})
+                options = quiz.get("options") or ru_q.get("options") or []
+                if not isinstance(options, list):
+                    options = list(options)
+                quiz_rows.append(
+                    {
+                        "segment_id": segment_pk,
+                        "question": quiz.get("question") or ru_q.get("question"),
+                        "options": options,
+                        "correct_index": int(quiz.get("correct_index") or 0),
+                        "explanation": quiz.get("explanation")
+                        or ru_q.get("explanation")
+                        or None,
+                        "language": quiz.get("language") or "ru",
+                    }
+                )
+        if (
+            len(quiz_rows) >= QUIZ_COPY_MIN_ROWS
+            and db.bind.dialect.name == "postgresql"
+        ):
+            await _copy_quiz_rows(db, quiz_rows)
+        elif quiz_rows:
+            await db.execute(insert(Quiz), quiz_rows)
+        return True
+
+    @staticmethod
+    async def _finalize(
+        task_id: str,
+        segments: list,
+        duration: Optional[float] = None,
+        video_metadata: Optional[dict] = None,
+    ):
+        """Write completed status and results in a single transaction."""
+        try:
+            redis = await _get_redis()
+            async with AsyncSessionLocal() as db, redis.pipeline(
+                transaction=False
+            ) as pipe:
+                # Cache writes are queued and sent in one round-trip after commit
+                task_service = TaskService(db, pipe)
+
+                await task_service.update_task_results(
+                    task_id=task_id,
+                    segments=segments,
+                    duration=duration,
+                    video_metadata=video_metadata,
+                    commit=False,
+                    completed=True,
+                )
+                await DBUpdater._write_video_results(db, task_id, segments, duration)
+                await db.commit()
+                await task_service.invalidate_segments_cache(task_id)
+                await pipe.execute()
+
+                logger.info(
+                    "Updated task %s results in database: %d segments",
+                    task_id,
+                    len(segments),
+                )
+        except Exception as e:
+            logger.error(f"Failed to finalize task {task_id} in database: {e}")
+
     @staticmethod
     async def set_processing_started(task_id: str):
         """Mark task as started processing."""
+        await _discard_progress(task_id)
         await DBUpdater.update_status(
             task_id, "processing", progress=0.0, current_stage="Starting"
         )
 
     @staticmethod
     async def set_stage_progress(task_id: str, stage: str, progress: float):
-        """Update task progress for a specific stage."""
-        await DBUpdater.update_status(
-            task_id, "processing", progress=progress, current_stage=stage
-        )
-        logger.debug(f"Task {task_id} - {stage}: {progress}%")
+        """Publish task progress for a specific stage."""
+        progress = float(int(progress))
+        if _last_progress.get(task_id) == (stage, progress):
+            return
+        _last_progress[task_id] = (stage, progress)
+        try:
+            redis = await _get_redis()
+            await redis.xadd(
+                PROGRESS_STREAM,
+                {"task_id": task_id, "stage": stage, "progress": str(progress)},
+                maxlen=PROGRESS_STREAM_MAXLEN,
+                approximate=True,
+            )
+        except Exception as e:
+            logger.warning(f"Progress stream unavailable, writing directly: {e}")
+            await DBUpdater.update_status(
+                task_id, "processing", progress=progress, current_stage=stage
+            )
+        logger.debug("Task %s - %s: %s%%", task_id, stage, progress)
 
     @staticmethod
     async def set_completed(
@@ -243,13 +466,8 @@ class DBUpdater:
         video_metadata: Optional[dict] = None,
     ):
         """Mark task as completed with results."""
-        # Update status first
-        await DBUpdater.update_status(
-            task_id, "completed", progress=100.0, current_stage="Completed"
-        )
-
-        # Then update results
-        await DBUpdater.update_results(
+        await _discard_progress(task_id)
+        await DBUpdater._finalize(
             task_id=task_id,
             segments=segments,
             duration=duration,
@@ -261,6 +479,7 @@ class DBUpdater:
     @staticmethod
     async def set_failed(task_id: str, error_message: str):
         """Mark task as failed with error message."""
+        await _discard_progress(task_id)
         await DBUpdater.update_status(
             task_id,
             "failed",
@@ -275,38 +494,74 @@ class DBUpdater:
         """Update video title in database."""
         try:
             async with AsyncSessionLocal() as db:
-                redis = await get_redis()
-                task_service = TaskService(db, redis)
-                await task_service.update_video_title(task_id, video_title)
-
-                try:
-                    task_uuid = UUID(task_id)
-                except Exception:
-                    task_uuid = task_id
-                try:
-                    video_result = await db.execute(
-                        select(Video).where(Video.task_id == task_uuid)
-                    )
-                    video = video_result.scalar_one_or_none()
-                    if video:
-                        video.title = video_title
-                        await db.commit()
-                        await db.refresh(video)
-                except Exception as e:  # noqa: BLE001
-                    logger.error(
-                        f"Failed to update video title for task {task_id}: {e}"
-                    )
+                await db.execute(
+                    update(Video)
+                    .where(Video.task_id == _to_task_uuid(task_id))
+                    .values(title=video_title)
+                    .execution_options(synchronize_session=False)
+                )
+                await db.commit()
 
                 logger.info(f"Updated video title for task {task_id}: {video_title}")
         except Exception as e:
             logger.error(f"Failed to update video title for task {task_id}: {e}")
 
+    @staticmethod
+    async def run_consumer():
+        """Write the latest streamed progress per task to the database."""
+        consumer = f"{socket.gethostname()}-{os.getpid()}"
+        redis = await _get_redis()
+        group_ready = False
+
+        while True:
+            try:
+                # Created inside the loop so the consumer survives Redis being
+                # down at startup and recreates a deleted stream or group
+                if not group_ready:
+                    await _create_consumer_group(redis)
+                    group_ready = True
+
+                response = await redis.xreadgroup(
+                    PROGRESS_CONSUMER_GROUP,
+                    consumer,
+                    {PROGRESS_STREAM: ">"},
+                    count=500,
+                    block=int(PROGRESS_FLUSH_INTERVAL * 1000),
+                )
+                if not response:
+                    continue
+
+                # Stream order is publish order, so later entries win
+                latest: Dict[str, dict] = {}
+                message_ids = []
+                for _, messages in response:
+                    for message_id, fields in messages:
+                        message_ids.append(message_id)
+                        latest[fields["task_id"]] = fields
+
+                async with _flush_lock:
+                    for task_id, fields in latest.items():
+                        if fields.get("done"):
+                            continue
+                        await DBUpdater.update_status(
+                            task_id,
+                            "processing",
+                            progress=float(fields["progress"]),
+                            current_stage=fields["stage"],
+                        )
+                await redis.xack(PROGRESS_STREAM, PROGRESS_CONSUMER_GROUP, *message_ids)
+            except Exception as e:
+                if "NOGROUP" in str(e):
+                    group_ready = False
+                logger.error(f"Progress stream consumer error: {e}")
+                await asyncio.sleep(PROGRESS_FLUSH_INTERVAL)
+
     @staticmethod
     async def get_task_from_db(task_id: str):
         """Get task from database."""
         try:
             async with AsyncSessionLocal() as db:
-                redis = await get_redis()
+                redis = await _get_redis()
                 task_service = TaskService(db, redis)
                 return await task_service.get_task(task_id)
         except Exception as e:
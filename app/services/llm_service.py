@@ -1,23 +1,366 @@
+import hashlib
+import heapq
 import json
 import logging
+import math
+import re
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Literal, Optional, Tuple
 
+import numpy as np
+import redis
 import requests
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.core.config import settings
 from app.schemas.models import (
     FrameAnalysis,
     Quiz,
     QuizTranslation,
+    QuizTranslations,
     QuizType,
     SegmentTranslation,
+    TranscriptionColumns,
     TranscriptionSegment,
     VideoSegment,
 )
 
 logger = logging.getLogger(__name__)
 
+# Connections kept open to Ollama; covers concurrent pipelines' LLM calls
+OLLAMA_POOL_SIZE = 16
+
+# Exact-prompt response cache, only used for deterministic (temperature 0) calls
+RESPONSE_CACHE_SIZE = 1024
+RESPONSE_CACHE_PREFIX = "llm_response:"
+# Marks the closing /api/generate stream chunk; in-text quotes arrive escaped
+_DONE_MARKER = b'"done":true'
+# Near-duplicate prompts kept per (model, temperature, max_tokens) partition
+SEMANTIC_CACHE_SIZE = 1024
+_PROMPT_MARKUP = re.compile(r"<\|[^|]*\|>")
+# Control characters other than JSON whitespace, mapped to spaces for str.translate
+_CONTROL_CHARS = {code: " " for code in range(32) if chr(code) not in "\n\r\t"}
+
+# Response formats shared by the single-purpose and the combined segment prompts
+QUIZ_ARRAY_FORMAT = """[
+  {
+    "type": "multiple_choice",
+    "translations": {
+      "ru": {
+        "question": "Вопрос на русском?",
+        "options": ["Вариант А", "Вариант Б", "Вариант В", "Вариант Г"],
+        "explanation": "Объяснение на русском"
+      },
+      "en": {
+        "question": "Question in English?",
+        "options": ["Option A", "Option B", "Option C", "Option D"],
+        "explanation": "Explanation in English"
+      },
+      "kk": {
+        "question": "Сұрақ қазақ тілінде?",
+        "options": ["Нұсқа А", "Нұсқа Б", "Нұсқа В", "Нұсқа Г"],
+        "explanation": "Қазақ тіліндегі түсініктеме"
+      }
+    },
+    "correct_index": 1
+  },
+  {
+    "type": "short_answer",
+    "translations": {
+      "ru": {
+        "question": "Короткий вопрос на русском?",
+        "short_answers": ["правильный ответ", "короткий вариант"],
+        "answer_case_sensitive": false,
+        "explanation": "Объяснение на русском"
+      },
+      "en": {
+        "question": "Short answer question in English?",
+        "short_answers": ["correct answer", "short variant"],
+        "answer_case_sensitive": false,
+        "explanation": "Explanation in English"
+      },
+      "kk": {
+        "question": "Қысқа жауап сұрағы?",
+        "short_answers": ["дұрыс жауап", "қысқа нұсқа"],
+        "answer_case_sensitive": false,
+        "explanation": "Қазақ тіліндегі түсініктеме"
+      }
+    }
+  }
+]"""
+
+QUIZ_RULES = """IMPORTANT:
+- All three translations must have the SAME correct_index for multiple_choice
+- short_answer questions MUST NOT include correct_index or options
+- short_answer must include short_answers array per language"""
+
+# Keyword candidates: runs of 5+ letters/digits in any script (Russian and
+# Kazakh transcripts included), found in one C-level scan
+_KEYWORD_TOKEN = re.compile(r"[^\W_]{5,}")
+# Common words never used as keywords
+_STOP_WORDS = frozenset(
+    {
+        "the",
+        "is",
+        "at",
+        "which",
+        "on",
+        "a",
+        "an",
+        "and",
+        "or",
+        "but",
+        "in",
+        "with",
+        "to",
+        "for",
+        "of",
+        "as",
+        "by",
+        "that",
+        "this",
+        "it",
+        "from",
+        "are",
+        "was",
+        "were",
+        "been",
+        "be",
+        "have",
+        "has",
+        "had",
+    }
+)
+
+# Placeholder options for a multiple-choice item the model returned without any
+_DEFAULT_MC_OPTIONS = ("A", "B", "C", "D")
+
+SEGMENT_TRANSLATION_FORMAT = """{
+  "ru": {
+    "topic_title": "Заголовок на русском",
+    "short_summary": "Краткое описание на русском"
+  },
+  "en": {
+    "topic_title": "Title in English",
+    "short_summary": "Short description in English"
+  },
+  "kk": {
+    "topic_title": "Қазақ тіліндегі тақырып",
+    "short_summary": "Қазақ тіліндегі қысқаша сипаттама"
+  }
+}"""
+
+# Chat-template prompt prefixes. Kept constant so every request of a kind starts
+# with the same text, which Ollama can serve from its cached prompt prefix.
+_USER_TURN = "<|eot_id|><|start_header_id|>user<|end_header_id|>\n\n"
+
+
+def _system_prompt_prefix(system: str) -> str:
+    """Llama chat header with the system message, ending at the user turn"""
+    return (
+        "<|begin_of_text|><|start_header_id|>system<|end_header_id|>\n\n"
+        + system
+        + _USER_TURN
+    )
+
+
+TITLE_PROMPT_PREFIX = _system_prompt_prefix(
+    "You are an expert at creating concise, descriptive titles for educational video content."
+)
+SEGMENTATION_PROMPT_PREFIX = _system_prompt_prefix(
+    "You are an expert at analyzing educational video content. Your task is to segment the video into logical topics or chapters based on the transcript and visual information."
+)
+QUIZ_PROMPT_PREFIX = _system_prompt_prefix(
+    "You are an expert multilingual educator. Create quiz questions in THREE languages: Russian (ru), English (en), and Kazakh (kk)."
+)
+TRANSLATION_PROMPT_PREFIX = _system_prompt_prefix(
+    "You are a professional translator. Translate the following video segment information into Russian, English, and Kazakh."
+)
+SEGMENT_BUNDLE_PROMPT_PREFIX = _system_prompt_prefix(
+    "You are an expert multilingual educator and translator. Translate video segment information and create quiz questions in THREE languages: Russian (ru), English (en), and Kazakh (kk)."
+)
+
+
+# Output schemas passed as Ollama's `format`, which constrains decoding to JSON
+# matching them (structured outputs, Ollama 0.5+)
+class _SegmentPlan(BaseModel):
+    start_time: float
+    end_time: float
+    topic: str
+    summary: str
+
+
+class _SegmentPlanList(BaseModel):
+    segments: List[_SegmentPlan]
+
+
+class _QuizText(BaseModel):
+    question: str
+    options: Optional[List[str]] = None
+    short_answers: Optional[List[str]] = None
+    answer_case_sensitive: Optional[bool] = None
+    explanation: Optional[str] = None
+
+
+class _QuizLanguages(BaseModel):
+    ru: _QuizText
+    en: _QuizText
+    kk: _QuizText
+
+
+class _QuizItem(BaseModel):
+    type: Literal["multiple_choice", "short_answer"]
+    translations: _QuizLanguages
+    correct_index: Optional[int] = None
+
+
+class _QuizList(BaseModel):
+    quizzes: List[_QuizItem]
+
+
+class _SegmentText(BaseModel):
+    topic_title: str
+    short_summary: str
+
+
+class _SegmentLanguages(BaseModel):
+    ru: _SegmentText
+    en: _SegmentText
+    kk: _SegmentText
+
+
+class _SegmentBundle(BaseModel):
+    translations: _SegmentLanguages
+    quizzes: List[_QuizItem]
+
+
+class _IndexedSegmentBundle(_SegmentBundle):
+    index: int
+
+
+class _SegmentBundleList(BaseModel):
+    segments: List[_IndexedSegmentBundle]
+
+
+SEGMENTATION_SCHEMA = _SegmentPlanList.model_json_schema()
+QUIZ_SCHEMA = _QuizList.model_json_schema()
+SEGMENT_TRANSLATION_SCHEMA = _SegmentLanguages.model_json_schema()
+SEGMENT_BUNDLE_SCHEMA = _SegmentBundle.model_json_schema()
+SEGMENT_BUNDLE_LIST_SCHEMA = _SegmentBundleList.model_json_schema()
+
+
+def _transcript_excerpt(
+    transcription: List[TranscriptionSegment], max_chars: int
+) -> str:
+    """Join segment texts until max_chars are covered, without joining the rest"""
+    parts = []
+    length = -1
+    for seg in transcription:
+        parts.append(seg.text)
+        length += len(seg.text) + 1
+        if length >= max_chars:
+            break
+    return " ".join(parts)[:max_chars]
+
+
+def _frame_context(frame_analyses: List[FrameAnalysis], limit: int) -> str:
+    """One line per analysed frame for the first `limit` frames"""
+    return "\n".join(
+        [
+            "At %.1fs: %s" % (fa.timestamp, fa.description[:100])
+            for fa in frame_analyses[:limit]
+        ]
+    )
+
+
+def _construct_quiz(
+    translations: Dict[str, QuizTranslation],
+    correct_index: Optional[int],
+    quiz_type: QuizType,
+) -> Quiz:
+    """Build a Quiz from trusted local values, skipping Pydantic validation"""
+    quiz = Quiz.model_construct(
+        translations=QuizTranslations.model_construct(**translations),
+        correct_index=correct_index,
+        type=quiz_type,
+    )
+    # model_construct does not run Quiz's after-validator
+    quiz._default_tr = quiz.translations.default_translation()
+    return quiz
+
+
+class _JsonEndScanner:
+    """Tracks bracket depth outside strings to spot where the first JSON value ends"""
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escape_next = False
+
+    def feed(self, text: str) -> bool:
+        """Consume streamed text; True once the outermost [...] or {...} closes"""
+        for char in text:
+            if self.in_string:
+                if self.escape_next:
+                    self.escape_next = False
+                elif char == "\\":
+                    self.escape_next = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                # Quotes in prose before the JSON value do not open strings
+                self.in_string = self.started
+            elif char in "[{":
+                self.depth += 1
+                self.started = True
+            elif char in "]}" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+
+class _SemanticCache:
+    """Nearest-neighbour response cache over L2-normalised prompt embeddings"""
+
+    def __init__(self, capacity: int, threshold: float):
+        self.capacity = capacity
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._vectors: Dict[tuple, np.ndarray] = {}
+        self._responses: Dict[tuple, List[str]] = {}
+
+    def lookup(self, partition: tuple, vector: np.ndarray) -> Optional[str]:
+        """Return the response of the most similar prompt above the threshold"""
+        with self._lock:
+            matrix = self._vectors.get(partition)
+            if matrix is None:
+                return None
+            scores = matrix @ vector
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                return self._responses[partition][best]
+        return None
+
+    def add(self, partition: tuple, vector: np.ndarray, response: str):
+        """Add a prompt embedding and its response, evicting the oldest entries"""
+        with self._lock:
+            matrix = self._vectors.get(partition)
+            if matrix is None:
+                matrix = vector[np.newaxis, :]
+            else:
+                matrix = np.vstack((matrix, vector))[-self.capacity :]
+            responses = self._responses.setdefault(partition, [])
+            responses.append(response)
+            del responses[: -self.capacity]
+            self._vectors[partition] = matrix
+
 
 class LLMService:
     """LLM service using Ollama for quiz generation and content segmentation"""
@@ -26,8 +369,42 @@ class LLMService:
         self.ollama_url = settings.OLLAMA_URL
         self.model_name = settings.OLLAMA_MODEL
         self.model_loaded = False
+        self._load_lock = threading.Lock()
+        self._session = self._create_session()
+        self._response_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        self._response_cache_lookups = 0
+        self._response_cache_hits = 0
+        self._redis = None
+        self._semantic_cache = _SemanticCache(
+            SEMANTIC_CACHE_SIZE, settings.LLM_SEMANTIC_CACHE_THRESHOLD
+        )
+
+    @staticmethod
+    def _create_session() -> requests.Session:
+        """HTTP session with pooled keep-alive connections to Ollama."""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=OLLAMA_POOL_SIZE,
+            pool_maxsize=OLLAMA_POOL_SIZE,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.2,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=("GET", "POST"),
+            ),
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Connection"] = "keep-alive"
+        return session
 
     def load_model(self):
+        """Check Ollama availability once, even when called from several threads"""
+        with self._load_lock:
+            self._connect()
+
+    def _connect(self):
         """Check Ollama availability"""
         if self.model_loaded:
             logger.info("Ollama already connected")
@@ -37,7 +414,7 @@ class LLMService:
             logger.info(f"Connecting to Ollama at {self.ollama_url}")
 
             # Check if Ollama is running
-            response = requests.get(f"{self.ollama_url}/api/tags", timeout=5)
+            response = self._session.get(f"{self.ollama_url}/api/tags", timeout=5)
 
             if response.status_code == 200:
                 models = response.json().get("models", [])
@@ -66,17 +443,32 @@ class LLMService:
             raise Exception(f"Ollama connection failed: {str(e)}")
 
     def unload_model(self):
-        """Unload model (no-op for Ollama)"""
+        """Unload model (model stays in Ollama); drops pooled connections"""
+        self._session.close()
         logger.info("Ollama connection closed (model stays in Ollama)")
         self.model_loaded = False
 
-    def generate_text(self, prompt: str, max_tokens: int = 1024) -> str:
+    def generate_text(
+        self,
+        prompt: str,
+        max_tokens: int = 1024,
+        json_mode: bool = False,
+        context_length: Optional[int] = None,
+        expect_json: bool = False,
+        json_schema: Optional[dict] = None,
+    ) -> str:
         """
         Generate text from prompt using Ollama
 
         Args:
             prompt: Input prompt
             max_tokens: Maximum tokens to generate
+            json_mode: Constrain the output to valid JSON (Ollama format=json)
+            context_length: Context window (num_ctx) for this request
+            expect_json: Stop generating once the first JSON array/object closes
+                (implied by json_mode)
+            json_schema: Constrain the output to JSON matching this schema
+                (implies json_mode)
 
         Returns:
             Generated text
@@ -84,29 +476,182 @@ class LLMService:
         if not self.model_loaded:
             self.load_model()
 
+        json_format = json_schema if json_schema is not None else json_mode or None
+        expect_json = expect_json or json_format is not None
+
+        # Sampled completions differ between calls, so only cache at temperature 0
+        if settings.LLAMA_TEMPERATURE > 0:
+            return self._request_generation(
+                prompt, max_tokens, json_format, context_length, expect_json
+            )
+
+        schema_name = json_schema.get("title") if json_schema else None
+        variant = (max_tokens, json_mode, schema_name, context_length, expect_json)
+        key = self._response_cache_key(prompt, variant)
+        cached = self._get_cached_response(key)
+        if cached is not None:
+            return cached
+
+        embedding = None
+        if settings.LLM_SEMANTIC_CACHE:
+            partition = (self.model_name, settings.LLAMA_TEMPERATURE, variant)
+            embedding = self._embed_prompt(prompt)
+            if embedding is not None:
+                cached = self._semantic_cache.lookup(partition, embedding)
+                if cached is not None:
+                    logger.debug("LLM semantic cache hit")
+                    return cached
+
+        text = self._request_generation(
+            prompt, max_tokens, json_format, context_length, expect_json
+        )
+        if text:
+            self._cache_response(key, text)
+            if embedding is not None:
+                self._semantic_cache.add(partition, embedding, text)
+        return text
+
+    def _embed_prompt(self, prompt: str) -> Optional[np.ndarray]:
+        """Embed a prompt without its chat-template markup, L2-normalised"""
+        text = " ".join(_PROMPT_MARKUP.sub(" ", prompt).split())
         try:
-            response = requests.post(
-                f"{self.ollama_url}/api/generate",
-                json={
-                    "model": self.model_name,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": settings.LLAMA_TEMPERATURE,
-                        "num_predict": max_tokens,
-                    },
-                },
-                timeout=120,
+            response = self._session.post(
+                f"{self.ollama_url}/api/embed",
+                json={"model": settings.OLLAMA_EMBED_MODEL, "input": text},
+                timeout=30,
+            )
+            response.raise_for_status()
+            vector = np.asarray(response.json()["embeddings"][0], dtype=np.float32)
+        except Exception as e:
+            logger.warning(f"Prompt embedding failed: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _response_cache_key(self, prompt: str, variant: tuple) -> str:
+        """Cache key over everything that determines a temperature-0 completion"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            f"{self.model_name}\0{settings.LLAMA_TEMPERATURE}\0{variant}\0".encode()
+        )
+        digest.update(prompt.encode())
+        return RESPONSE_CACHE_PREFIX + digest.hexdigest()
+
+    def _get_redis(self):
+        """Lazily create the sync Redis client used for the shared response cache"""
+        if self._redis is None and settings.REDIS_URL:
+            self._redis = redis.Redis.from_url(
+                settings.REDIS_URL, decode_responses=True
             )
+        return self._redis
+
+    def _get_cached_response(self, key: str) -> Optional[str]:
+        """Look a response up in the in-process LRU, then in Redis"""
+        with self._response_cache_lock:
+            self._response_cache_lookups += 1
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                self._response_cache.move_to_end(key)
+                self._response_cache_hits += 1
+
+        if cached is None:
+            try:
+                client = self._get_redis()
+                cached = client.get(key) if client is not None else None
+            except Exception as e:
+                logger.warning(f"Failed to read LLM response cache: {e}")
+            if cached is not None:
+                with self._response_cache_lock:
+                    self._response_cache_hits += 1
+                self._remember_response(key, cached)
+
+        logger.debug(
+            f"LLM response cache {'hit' if cached is not None else 'miss'} "
+            f"({self._response_cache_hits}/{self._response_cache_lookups})"
+        )
+        return cached
+
+    def _remember_response(self, key: str, text: str):
+        """Store a response in the in-process LRU"""
+        with self._response_cache_lock:
+            self._response_cache[key] = text
+            self._response_cache.move_to_end(key)
+            if len(self._response_cache) > RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+
+    def _cache_response(self, key: str, text: str):
+        """Store a response in the in-process LRU and in Redis"""
+        self._remember_response(key, text)
+        try:
+            client = self._get_redis()
+            if client is not None:
+                client.setex(key, settings.REDIS_CACHE_TTL, text)
+        except Exception as e:
+            logger.warning(f"Failed to write LLM response cache: {e}")
 
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "").strip()
-            else:
-                logger.error(
-                    f"Ollama returned status {response.status_code}: {response.text}"
-                )
-                return ""
+    def _request_generation(
+        self,
+        prompt: str,
+        max_tokens: int,
+        json_format=None,
+        context_length: Optional[int] = None,
+        expect_json: bool = False,
+    ) -> str:
+        """Stream one prompt through Ollama's /api/generate; empty string on failure
+
+        json_format is True for format=json or a JSON schema for structured output.
+
+        With expect_json the stream is closed as soon as the first JSON value is
+        complete, which makes Ollama stop generating instead of padding it.
+        The final chunk is not decoded: its text is empty and it carries the
+        multi-KB `context` token array and timing stats we never use.
+        """
+        payload = {
+            "model": self.model_name,
+            "prompt": prompt,
+            "stream": True,
+            "keep_alive": settings.OLLAMA_KEEP_ALIVE,
+            "options": {
+                "temperature": settings.LLAMA_TEMPERATURE,
+                "num_predict": max_tokens,
+            },
+        }
+        if json_format is True:
+            payload["format"] = "json"
+        elif json_format:
+            payload["format"] = json_format
+        if context_length:
+            payload["options"]["num_ctx"] = context_length
+        try:
+            with self._session.post(
+                f"{self.ollama_url}/api/generate",
+                json=payload,
+                timeout=120 * (1 + max_tokens // 4096),
+                stream=True,
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(
+                        f"Ollama returned status {response.status_code}: {response.text}"
+                    )
+                    return ""
+
+                scanner = _JsonEndScanner() if expect_json else None
+                parts = []
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    if _DONE_MARKER in line:
+                        break
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        logger.error(f"Ollama stream error: {chunk['error']}")
+                        return ""
+                    piece = chunk.get("response", "")
+                    parts.append(piece)
+                    if scanner is not None and scanner.feed(piece):
+                        logger.debug("JSON response complete, closing stream")
+                        break
+                return "".join(parts).strip()
 
         except Exception as e:
             logger.error(f"Text generation failed: {e}")
@@ -130,32 +675,21 @@ class LLMService:
         Returns:
             Generated video title
         """
-        if not self.model_loaded:
-            self.load_model()
-
         logger.info("Generating video title")
 
         try:
             # Prepare context from transcription
-            transcript_text = " ".join([seg.text for seg in transcription[:50]])
+            transcript_text = _transcript_excerpt(transcription[:50], 1000)
 
             # Get frame descriptions at key timestamps
-            frame_context = "\n".join(
-                [
-                    f"At {fa.timestamp:.1f}s: {fa.description[:100]}"
-                    for fa in frame_analyses[:5]
-                ]
-            )
+            frame_context = _frame_context(frame_analyses, 5)
 
             # Create title generation prompt
-            prompt = f"""<|begin_of_text|><|start_header_id|>system<|end_header_id|>
-
-You are an expert at creating concise, descriptive titles for educational video content.<|eot_id|><|start_header_id|>user<|end_header_id|>
-
-Video Duration: {video_duration:.1f} seconds
+            prompt = (
+                TITLE_PROMPT_PREFIX + f"""Video Duration: {video_duration:.1f} seconds
 
 Transcript excerpt:
-{transcript_text[:1000]}
+{transcript_text}
 
 Visual Information:
 {frame_context}
@@ -168,6 +702,7 @@ Task: Generate a short, descriptive title for this video (maximum 80 characters)
 Respond with ONLY the title text, nothing else.
 
 Response:"""
+            )
 
             # Generate title
             title = self.generate_text(prompt, max_tokens=100)
@@ -194,7 +729,7 @@ Response:"""
         except Exception as e:
             logger.error(f"Title generation failed: {e}")
             # Fallback: use first few words from transcript
-            transcript_text = " ".join([seg.text for seg in transcription[:10]])
+            transcript_text = _transcript_excerpt(transcription[:10], 1000)
             words = transcript_text.split()[:8]
             title = " ".join(words)
             if len(title) > 80:
@@ -218,32 +753,23 @@ Response:"""
         Returns:
             List of segment definitions with start/end times and topics
         """
-        if not self.model_loaded:
-            self.load_model()
-
         logger.info("Segmenting video content into topics")
 
         try:
-            # Prepare context from transcription and frames
-            transcript_text = " ".join([seg.text for seg in transcription])
+            # Prepare context from transcription and frames; only the first
+            # 2000 characters go into the prompt
+            transcript_text = _transcript_excerpt(transcription, 2000)
 
             # Get frame descriptions at key timestamps
-            frame_context = "\n".join(
-                [
-                    f"At {fa.timestamp:.1f}s: {fa.description[:100]}"
-                    for fa in frame_analyses[:10]
-                ]
-            )
+            frame_context = _frame_context(frame_analyses, 10)
 
             # Create segmentation prompt
-            prompt = f"""<|begin_of_text|><|start_header_id|>system<|end_header_id|>
-
-You are an expert at analyzing educational video content. Your task is to segment the video into logical topics or chapters based on the transcript and visual information.<|eot_id|><|start_header_id|>user<|end_header_id|>
-
-Video Duration: {video_duration:.1f} seconds
+            prompt = (
+                SEGMENTATION_PROMPT_PREFIX
+                + f"""Video Duration: {video_duration:.1f} seconds
 
 Transcript:
-{transcript_text[:2000]}
+{transcript_text}
 
 Visual Information:
 {frame_context}
@@ -254,16 +780,19 @@ Task: Divide this video into 3-6 logical segments based on topic changes. For ea
 3. Topic title (short, descriptive)
 4. Brief summary (1-2 sentences)
 
-Format your response as JSON array:
-[
+Format your response as a JSON object with a "segments" array:
+{{"segments": [
   {{"start_time": 0, "end_time": 45.5, "topic": "Introduction to Topic", "summary": "Brief description"}},
   ...
-]
+]}}
 
 Response:"""
+            )
 
             # Generate segmentation
-            response = self.generate_text(prompt, max_tokens=1024)
+            response = self.generate_text(
+                prompt, max_tokens=1024, json_schema=SEGMENTATION_SCHEMA
+            )
 
             # Parse JSON response
             segments = self._parse_json_response(response)
@@ -294,20 +823,15 @@ Response:"""
         Returns:
             List of Quiz objects with multilingual translations
         """
-        if not self.model_loaded:
-            self.load_model()
-
-        logger.info(
+        logger.debug(
             f"Generating multilingual quizzes for: {segment_info.get('topic', 'segment')}"
         )
 
         try:
             # Create quiz generation prompt for all three languages
-            prompt = f"""<|begin_of_text|><|start_header_id|>system<|end_header_id|>
-
-You are an expert multilingual educator. Create quiz questions in THREE languages: Russian (ru), English (en), and Kazakh (kk).<|eot_id|><|start_header_id|>user<|end_header_id|>
-
-Topic: {segment_info.get("topic", "Video Content")}
+            prompt = (
+                QUIZ_PROMPT_PREFIX
+                + f"""Topic: {segment_info.get("topic", "Video Content")}
 Summary: {segment_info.get("summary", "")}
 
 Content:
@@ -315,73 +839,36 @@ Content:
 
 Task: Create {settings.QUIZZES_PER_SEGMENT} multiple-choice questions AND {settings.SHORT_ANSWER_QUIZZES_PER_SEGMENT} short-answer questions. For EACH question, provide translations in ALL THREE languages.
 
-Format as JSON array with this EXACT structure:
-[
-  {{
-    "type": "multiple_choice",
-    "translations": {{
-      "ru": {{
-        "question": "Вопрос на русском?",
-        "options": ["Вариант А", "Вариант Б", "Вариант В", "Вариант Г"],
-        "explanation": "Объяснение на русском"
-      }},
-      "en": {{
-        "question": "Question in English?",
-        "options": ["Option A", "Option B", "Option C", "Option D"],
-        "explanation": "Explanation in English"
-      }},
-      "kk": {{
-        "question": "Сұрақ қазақ тілінде?",
-        "options": ["Нұсқа А", "Нұсқа Б", "Нұсқа В", "Нұсқа Г"],
-        "explanation": "Қазақ тіліндегі түсініктеме"
-      }}
-    }},
-    "correct_index": 1
-  }},
-  {{
-    "type": "short_answer",
-    "translations": {{
-      "ru": {{
-        "question": "Короткий вопрос на русском?",
-        "short_answers": ["правильный ответ", "короткий вариант"],
-        "answer_case_sensitive": false,
-        "explanation": "Объяснение на русском"
-      }},
-      "en": {{
-        "question": "Short answer question in English?",
-        "short_answers": ["correct answer", "short variant"],
-        "answer_case_sensitive": false,
-        "explanation": "Explanation in English"
-      }},
-      "kk": {{
-        "question": "Қысқа жауап сұрағы?",
-        "short_answers": ["дұрыс жауап", "қысқа нұсқа"],
-        "answer_case_sensitive": false,
-        "explanation": "Қазақ тіліндегі түсініктеме"
-      }}
-    }}
-  }}
-]
+Format as a JSON object {{"quizzes": [...]}} where the array has this EXACT structure:
+{QUIZ_ARRAY_FORMAT}
 
-IMPORTANT:
-- All three translations must have the SAME correct_index for multiple_choice
-- short_answer questions MUST NOT include correct_index or options
-- short_answer must include short_answers array per language
+{QUIZ_RULES}
 
 Response:"""
+            )
 
             # Generate quizzes
-            response = self.generate_text(prompt, max_tokens=2048)
+            response = self.generate_text(
+                prompt, max_tokens=2048, json_schema=QUIZ_SCHEMA
+            )
 
             # Parse JSON response
             quiz_data = self._parse_json_response(response)
+            return self._build_multilingual_quizzes(quiz_data, segment_info)
 
-            if not quiz_data:
-                logger.warning(
-                    "Could not parse multilingual quiz response, using fallback"
-                )
-                return self._create_fallback_multilingual_quizzes(segment_info)
+        except Exception as e:
+            logger.error(f"Multilingual quiz generation failed: {e}")
+            return self._create_fallback_multilingual_quizzes(segment_info)
 
+    def _build_multilingual_quizzes(
+        self, quiz_data: list, segment_info: dict
+    ) -> List[Quiz]:
+        """Convert parsed quiz items to Quiz objects, falling back when none are valid"""
+        if not quiz_data or not isinstance(quiz_data, list):
+            logger.warning("Could not parse multilingual quiz response, using fallback")
+            return self._create_fallback_multilingual_quizzes(segment_info)
+
+        try:
             # Convert to Quiz objects
             quizzes = []
             total_mc = settings.QUIZZES_PER_SEGMENT
@@ -450,7 +937,11 @@ Response:"""
                             trans = translations_data[lang] or {}
                             translations[lang] = QuizTranslation(
                                 question=trans.get("question", "Question?"),
-                                options=trans.get("options", ["A", "B", "C", "D"]),
+                                options=(
+                                    trans["options"]
+                                    if "options" in trans
+                                    else list(_DEFAULT_MC_OPTIONS)
+                                ),
                                 explanation=trans.get("explanation"),
                             )
 
@@ -469,7 +960,7 @@ Response:"""
                 logger.warning("No valid quizzes generated, using fallback")
                 return self._create_fallback_multilingual_quizzes(segment_info)
 
-            logger.info(f"Generated {len(quizzes)} multilingual quizzes")
+            logger.debug(f"Generated {len(quizzes)} multilingual quizzes")
             return quizzes
 
         except Exception as e:
@@ -502,97 +993,183 @@ Response:"""
         Returns:
             Dict with translations for ru, en, kk
         """
-        if not self.model_loaded:
-            self.load_model()
-
         try:
-            prompt = f"""<|begin_of_text|><|start_header_id|>system<|end_header_id|>
-
-You are a professional translator. Translate the following video segment information into Russian, English, and Kazakh.<|eot_id|><|start_header_id|>user<|end_header_id|>
-
-Original Topic: {topic}
+            prompt = TRANSLATION_PROMPT_PREFIX + f"""Original Topic: {topic}
 Original Summary: {summary}
 
 Provide translations in JSON format:
-{{
-  "ru": {{
-    "topic_title": "Заголовок на русском",
-    "short_summary": "Краткое описание на русском"
-  }},
-  "en": {{
-    "topic_title": "Title in English",
-    "short_summary": "Short description in English"
-  }},
-  "kk": {{
-    "topic_title": "Қазақ тіліндегі тақырып",
-    "short_summary": "Қазақ тіліндегі қысқаша сипаттама"
-  }}
-}}
+{SEGMENT_TRANSLATION_FORMAT}
 
 Response:"""
 
-            response = self.generate_text(prompt, max_tokens=512)
+            response = self.generate_text(
+                prompt, max_tokens=512, json_schema=SEGMENT_TRANSLATION_SCHEMA
+            )
             logger.debug(f"Translation response (first 500 chars): {response[:500]}")
 
-            # Parse JSON object (not array) for translations
-            try:
-                # Try to find JSON object in response
-                start_idx = response.find("{")
-                end_idx = response.rfind("}") + 1
-
-                if start_idx != -1 and end_idx > start_idx:
-                    json_str = response[start_idx:end_idx]
-                    # Clean invalid control characters from JSON
-                    json_str = (
-                        json_str.replace("\n", " ")
-                        .replace("\r", " ")
-                        .replace("\t", " ")
-                    )
-                    # Remove other control characters
-                    json_str = "".join(
-                        char if ord(char) >= 32 or char in "\n\r\t" else " "
-                        for char in json_str
-                    )
-                    translations_data = json.loads(json_str)
-                else:
-                    # Try parsing entire response
-                    response_clean = (
-                        response.replace("\n", " ")
-                        .replace("\r", " ")
-                        .replace("\t", " ")
-                    )
-                    translations_data = json.loads(response_clean)
-            except json.JSONDecodeError as e:
-                logger.warning(f"JSON parsing failed for translations: {e}")
-                logger.debug(f"Failed to parse response: {response[:1000]}")
-                raise ValueError("Invalid translation response")
-
-            if not translations_data or not isinstance(translations_data, dict):
-                raise ValueError("Invalid translation response")
-
-            translations = {}
-            for lang in ["ru", "en", "kk"]:
-                if lang in translations_data:
-                    trans = translations_data[lang]
-                    translations[lang] = SegmentTranslation(
-                        topic_title=trans.get("topic_title", topic),
-                        short_summary=trans.get("short_summary", summary),
-                    )
-                else:
-                    # Fallback
-                    translations[lang] = SegmentTranslation(
-                        topic_title=topic, short_summary=summary
-                    )
-
-            return translations
+            translations_data = self._parse_json_object(response)
+            return self._build_segment_translations(translations_data, topic, summary)
 
         except Exception as e:
             logger.error(f"Translation failed: {e}, using fallback")
-            # Fallback: use same text for all languages
-            return {
-                lang: SegmentTranslation(topic_title=topic, short_summary=summary)
-                for lang in ["ru", "en", "kk"]
-            }
+            return self._build_segment_translations(None, topic, summary)
+
+    def _build_segment_translations(
+        self, translations_data: Optional[dict], topic: str, summary: str
+    ) -> Dict[str, SegmentTranslation]:
+        """Build per-language segment translations, using the original text where missing"""
+        if not translations_data or not isinstance(translations_data, dict):
+            logger.warning("Invalid translation response, using fallback")
+            translations_data = {}
+
+        translations = {}
+        for lang in ["ru", "en", "kk"]:
+            trans = translations_data.get(lang)
+            if isinstance(trans, dict):
+                translations[lang] = SegmentTranslation(
+                    topic_title=trans.get("topic_title", topic),
+                    short_summary=trans.get("short_summary", summary),
+                )
+            else:
+                # Fallback: same text for this language
+                translations[lang] = SegmentTranslation(
+                    topic_title=topic, short_summary=summary
+                )
+
+        return translations
+
+    def generate_segment_bundle(
+        self, segment_info: dict, transcript_text: str
+    ) -> Tuple[List[Quiz], Dict[str, SegmentTranslation]]:
+        """
+        Generate multilingual quizzes and segment translations in one LLM call
+
+        Args:
+            segment_info: Segment information (topic, summary, etc.)
+            transcript_text: Transcript text for this segment
+
+        Returns:
+            Tuple of (quizzes, translations for ru, en, kk)
+        """
+        topic = segment_info.get("topic", "Video Content")
+        summary = segment_info.get("summary", "")
+        logger.debug(f"Generating quizzes and translations for: {topic}")
+
+        try:
+            prompt = SEGMENT_BUNDLE_PROMPT_PREFIX + f"""Topic: {topic}
+Summary: {summary}
+
+Content:
+{transcript_text[:1500]}
+
+Task:
+1. Translate the topic and summary into Russian, English, and Kazakh.
+2. Create {settings.QUIZZES_PER_SEGMENT} multiple-choice questions AND {settings.SHORT_ANSWER_QUIZZES_PER_SEGMENT} short-answer questions. For EACH question, provide translations in ALL THREE languages.
+
+Format as a JSON object with exactly two keys: "translations" with this structure:
+{SEGMENT_TRANSLATION_FORMAT}
+
+and "quizzes" with this EXACT structure:
+{QUIZ_ARRAY_FORMAT}
+
+{QUIZ_RULES}
+
+Response:"""
+
+            response = self.generate_text(
+                prompt, max_tokens=2560, json_schema=SEGMENT_BUNDLE_SCHEMA
+            )
+            bundle = self._parse_json_object(response) or {}
+        except Exception as e:
+            logger.error(f"Segment bundle generation failed: {e}, using fallback")
+            bundle = {}
+
+        quizzes = self._build_multilingual_quizzes(bundle.get("quizzes"), segment_info)
+        translations = self._build_segment_translations(
+            bundle.get("translations"), topic, summary
+        )
+        return quizzes, translations
+
+    def generate_all_segment_quizzes(
+        self, segment_infos: List[dict], transcripts: List[str]
+    ) -> List[Optional[Tuple[List[Quiz], Dict[str, SegmentTranslation]]]]:
+        """
+        Generate quizzes and translations for several segments in one LLM call
+
+        Args:
+            segment_infos: Segment information (topic, summary, etc.) per segment
+            transcripts: Transcript text per segment
+
+        Returns:
+            Per-segment (quizzes, translations), or None for segments missing from
+            the response so the caller can fall back to generate_segment_bundle
+        """
+        count = len(segment_infos)
+        logger.debug(f"Generating quizzes and translations for {count} segments")
+
+        sections = "\n\n".join(
+            f"""### Segment {index}
+Topic: {info.get("topic", "Video Content")}
+Summary: {info.get("summary", "")}
+
+Content:
+{transcript[:1500]}"""
+            for index, (info, transcript) in enumerate(
+                zip(segment_infos, transcripts), start=1
+            )
+        )
+
+        prompt = SEGMENT_BUNDLE_PROMPT_PREFIX + f"""{sections}
+
+Task: For EACH of the {count} segments above:
+1. Translate the topic and summary into Russian, English, and Kazakh.
+2. Create {settings.QUIZZES_PER_SEGMENT} multiple-choice questions AND {settings.SHORT_ANSWER_QUIZZES_PER_SEGMENT} short-answer questions. For EACH question, provide translations in ALL THREE languages.
+
+Format as a JSON object {{"segments": [...]}} with one entry per segment. Each entry has "index" (the segment number), "translations" with this structure:
+{SEGMENT_TRANSLATION_FORMAT}
+
+and "quizzes" with this EXACT structure:
+{QUIZ_ARRAY_FORMAT}
+
+{QUIZ_RULES}
+
+Response:"""
+
+        results: List[Optional[Tuple[List[Quiz], Dict[str, SegmentTranslation]]]]
+        results = [None] * count
+        try:
+            response = self.generate_text(
+                prompt,
+                max_tokens=2560 * count,
+                json_schema=SEGMENT_BUNDLE_LIST_SCHEMA,
+                context_length=settings.LLAMA_MAX_LENGTH * count,
+            )
+            data = self._parse_json_object(response) or {}
+            for item in data.get("segments") or []:
+                if not isinstance(item, dict):
+                    continue
+                index = item.get("index")
+                if not isinstance(index, int) or not 1 <= index <= count:
+                    continue
+                quiz_data = item.get("quizzes")
+                if not quiz_data or not isinstance(quiz_data, list):
+                    continue
+                info = segment_infos[index - 1]
+                results[index - 1] = (
+                    self._build_multilingual_quizzes(quiz_data, info),
+                    self._build_segment_translations(
+                        item.get("translations"),
+                        info.get("topic", "Video Content"),
+                        info.get("summary", ""),
+                    ),
+                )
+        except Exception as e:
+            logger.error(f"Batched segment generation failed: {e}")
+
+        missing = results.count(None)
+        if missing:
+            logger.warning(f"Batched response missed {missing} of {count} segments")
+        return results
 
     def segment_and_generate_quizzes(
         self,
@@ -619,28 +1196,71 @@ Response:"""
             transcription, frame_analyses, video_duration
         )
 
-        # Step 2: Generate multilingual quizzes for each segment
+        # Step 2: Generate multilingual quizzes and translations, with up to
+        # LLM_SEGMENTS_PER_CALL segments per LLM call. Calls are issued
+        # concurrently up to the number of requests Ollama serves in parallel
         video_segments = []
+        columns = TranscriptionColumns.from_segments(transcription)
 
-        for seg_def in segment_defs:
-            start_time = seg_def.get("start_time", 0)
-            end_time = seg_def.get("end_time", video_duration)
+        start_times = [seg_def.get("start_time", 0) for seg_def in segment_defs]
+        end_times = [
+            seg_def.get("end_time", video_duration) for seg_def in segment_defs
+        ]
+        segment_texts = columns.texts_between(start_times, end_times)
 
-            # Get transcript for this segment
-            segment_transcript = self._get_transcript_for_range(
-                transcription, start_time, end_time
-            )
+        prepared = []
+        for index, (seg_def, start_time, end_time, segment_transcript) in enumerate(
+            zip(segment_defs, start_times, end_times, segment_texts), start=1
+        ):
+            topic = seg_def.get("topic", f"Segment {index}")
+            summary = seg_def.get("summary", "Video content segment")
+            segment_info = dict(seg_def, topic=topic, summary=summary)
+            prepared.append((start_time, end_time, segment_transcript, segment_info))
+
+        batch_size = max(1, settings.LLM_SEGMENTS_PER_CALL)
+        results = [None] * len(prepared)
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, settings.OLLAMA_NUM_PARALLEL)
+        ) as executor:
+            if batch_size > 1:
+                batches = [
+                    prepared[i : i + batch_size]
+                    for i in range(0, len(prepared), batch_size)
+                ]
+                batch_futures = [
+                    executor.submit(
+                        self.generate_all_segment_quizzes,
+                        [item[3] for item in batch],
+                        [item[2] for item in batch],
+                    )
+                    for batch in batches
+                ]
+                results = [
+                    result for future in batch_futures for result in future.result()
+                ]
 
-            # Generate multilingual quizzes
-            quizzes = self.generate_multilingual_quizzes(seg_def, segment_transcript)
+            # One call per segment for anything a batched response did not cover
+            fallbacks = {
+                i: executor.submit(self.generate_segment_bundle, item[3], item[2])
+                for i, item in enumerate(prepared)
+                if results[i] is None
+            }
+            for i, future in fallbacks.items():
+                results[i] = future.result()
 
-            # Translate segment title and summary
-            topic = seg_def.get("topic", f"Segment {len(video_segments) + 1}")
-            summary = seg_def.get("summary", "Video content segment")
-            translations = self.translate_segment_text(topic, summary)
+        # Keywords are ranked against the other segments of the same video
+        segment_keywords = self._extract_segment_keywords(
+            [item[2] for item in prepared]
+        )
 
-            # Extract keywords from transcript
-            keywords = self._extract_keywords(segment_transcript)
+        # One summary line per segment; per-call progress is logged at DEBUG
+        log_segments = logger.isEnabledFor(logging.INFO)
+        for (start_time, end_time, _, segment_info), result, keywords in zip(
+            prepared, results, segment_keywords
+        ):
+            quizzes, translations = result
+            topic = segment_info["topic"]
 
             # Create VideoSegment with multilingual support
             video_segment = VideoSegment(
@@ -652,9 +1272,12 @@ Response:"""
             )
 
             video_segments.append(video_segment)
-            logger.info(
-                f"Completed multilingual segment: {topic} ({start_time:.1f}s - {end_time:.1f}s)"
-            )
+            if log_segments:
+                logger.info(
+                    f"Completed multilingual segment: {topic} "
+                    f"({start_time:.1f}s - {end_time:.1f}s), {len(quizzes)} quizzes, "
+                    f"{len(keywords)} keywords"
+                )
 
         logger.info(
             f"Pipeline completed: {len(video_segments)} multilingual segments created"
@@ -663,8 +1286,21 @@ Response:"""
 
     def _parse_json_response(self, response: str) -> List[dict]:
         """Parse JSON from LLM response"""
+        # Schema-constrained output is clean JSON: an array, or an object
+        # wrapping one (e.g. {"segments": [...]})
+        try:
+            data = json.loads(response)
+            if isinstance(data, list):
+                return data
+            if isinstance(data, dict):
+                for value in data.values():
+                    if isinstance(value, list):
+                        return value
+        except ValueError:
+            pass
+
         try:
-            # Try to find JSON array in response
+            # Fallback for free-form output: find JSON array in response
             start_idx = response.find("[")
             end_idx = response.rfind("]") + 1
 
@@ -680,56 +1316,59 @@ Response:"""
                 json_str.replace("\\n", " ").replace("\\r", " ").replace("\\t", " ")
             )
 
-            # Remove actual control characters (but keep JSON structural characters)
-            cleaned = []
-            in_string = False
-            escape_next = False
+            # Replace other control characters in C; strict=False accepts raw
+            # newlines and tabs inside string values
+            return json.loads(json_str.translate(_CONTROL_CHARS), strict=False)
 
-            for char in json_str:
-                if escape_next:
-                    cleaned.append(char)
-                    escape_next = False
-                    continue
-
-                if char == "\\":
-                    escape_next = True
-                    cleaned.append(char)
-                    continue
+        except json.JSONDecodeError as e:
+            logger.warning(f"JSON parsing failed: {e}")
+            logger.debug(f"Failed to parse response: {response[:1000]}")
+            return []
 
-                if char == '"' and not escape_next:
-                    in_string = not in_string
-                    cleaned.append(char)
-                    continue
+    def _parse_json_object(self, response: str) -> Optional[dict]:
+        """Parse a top-level JSON object from LLM response"""
+        # Schema-constrained output is clean JSON
+        try:
+            data = json.loads(response)
+            if isinstance(data, dict):
+                return data
+        except ValueError:
+            pass
 
-                # If we're inside a string, replace control characters with spaces
-                if in_string and ord(char) < 32 and char not in "\n\r\t":
-                    cleaned.append(" ")
-                else:
-                    cleaned.append(char)
+        try:
+            # Fallback for free-form output: find JSON object in response
+            start_idx = response.find("{")
+            end_idx = response.rfind("}") + 1
 
-            json_str = "".join(cleaned)
+            if start_idx != -1 and end_idx > start_idx:
+                json_str = response[start_idx:end_idx]
+            else:
+                # Try parsing entire response
+                json_str = response
 
-            return json.loads(json_str)
+            # Clean invalid control characters from JSON
+            data = json.loads(json_str.translate(_CONTROL_CHARS), strict=False)
+            return data if isinstance(data, dict) else None
 
         except json.JSONDecodeError as e:
-            logger.warning(f"JSON parsing failed: {e}")
+            logger.warning(f"JSON object parsing failed: {e}")
             logger.debug(f"Failed to parse response: {response[:1000]}")
-            return []
+            return None
 
     def _create_fallback_segments(
         self, video_duration: float, transcription: List[TranscriptionSegment]
     ) -> List[dict]:
         """Create simple time-based segments as fallback"""
         num_segments = min(5, max(3, int(video_duration / 60)))  # 3-5 segments
-        segment_duration = video_duration / num_segments
+        edges = np.linspace(0.0, video_duration, num_segments + 1).tolist()
+        starts, ends = edges[:-1], edges[1:]
 
-        segments = []
-        for i in range(num_segments):
-            start = i * segment_duration
-            end = min((i + 1) * segment_duration, video_duration)
+        # Get sample text for all segments at once
+        columns = TranscriptionColumns.from_segments(transcription)
+        sample_texts = columns.texts_between(starts, ends)
 
-            # Get sample text for this segment
-            sample_text = self._get_transcript_for_range(transcription, start, end)
+        segments = []
+        for i, (start, end, sample_text) in enumerate(zip(starts, ends, sample_texts)):
             words = sample_text.split()[:10]
             topic = " ".join(words) if words else f"Segment {i + 1}"
 
@@ -749,17 +1388,17 @@ Response:"""
         topic = segment_info.get("topic", "this content")
 
         translations = {
-            "ru": QuizTranslation(
+            "ru": QuizTranslation.model_construct(
                 question=f"О чём говорится в этом сегменте про {topic}?",
                 options=[topic, "Несвязанная тема А", "Несвязанная тема Б", "Другое"],
                 explanation=f"Этот сегмент посвящён {topic}.",
             ),
-            "en": QuizTranslation(
+            "en": QuizTranslation.model_construct(
                 question=f"What is discussed in the segment about {topic}?",
                 options=[topic, "Unrelated topic A", "Unrelated topic B", "Other"],
                 explanation=f"This segment focuses on {topic}.",
             ),
-            "kk": QuizTranslation(
+            "kk": QuizTranslation.model_construct(
                 question=f"{topic} туралы бұл сегментте не талқыланады?",
                 options=[
                     topic,
@@ -771,29 +1410,23 @@ Response:"""
             ),
         }
 
-        quizzes = [
-            Quiz(
-                translations=translations,
-                correct_index=0,
-                type=QuizType.MULTIPLE_CHOICE,
-            )
-        ]
+        quizzes = [_construct_quiz(translations, 0, QuizType.MULTIPLE_CHOICE)]
 
         if settings.SHORT_ANSWER_QUIZZES_PER_SEGMENT > 0:
             short_translations = {
-                "ru": QuizTranslation(
+                "ru": QuizTranslation.model_construct(
                     question=f"Назовите ключевую тему сегмента про {topic}.",
                     short_answers=[topic],
                     answer_case_sensitive=False,
                     explanation=f"Ключевая тема сегмента — {topic}.",
                 ),
-                "en": QuizTranslation(
+                "en": QuizTranslation.model_construct(
                     question=f"Name the key topic of the segment about {topic}.",
                     short_answers=[topic],
                     answer_case_sensitive=False,
                     explanation=f"The key topic of the segment is {topic}.",
                 ),
-                "kk": QuizTranslation(
+                "kk": QuizTranslation.model_construct(
                     question=f"{topic} туралы сегменттің негізгі тақырыбын атаңыз.",
                     short_answers=[topic],
                     answer_case_sensitive=False,
@@ -802,11 +1435,7 @@ Response:"""
             }
 
             quizzes.append(
-                Quiz(
-                    translations=short_translations,
-                    correct_index=None,
-                    type=QuizType.SHORT_ANSWER,
-                )
+                _construct_quiz(short_translations, None, QuizType.SHORT_ANSWER)
             )
 
         return quizzes
@@ -815,62 +1444,47 @@ Response:"""
         """Create simple fallback quizzes (uses multilingual version)"""
         return self._create_fallback_multilingual_quizzes(segment_info)
 
-    def _get_transcript_for_range(
-        self,
-        transcription: List[TranscriptionSegment],
-        start_time: float,
-        end_time: float,
-    ) -> str:
-        """Get transcript text for time range"""
-        text_parts = []
-        for seg in transcription:
-            if seg.end >= start_time and seg.start <= end_time:
-                text_parts.append(seg.text)
-        return " ".join(text_parts)
+    def _keyword_tokens(self, text: str) -> Iterator[str]:
+        """Yield cleaned candidate keywords (long, non-stop words) in text order"""
+        for match in _KEYWORD_TOKEN.finditer(text.lower()):
+            word = match.group()
+            if word not in _STOP_WORDS:
+                yield word
 
     def _extract_keywords(self, text: str, max_keywords: int = 10) -> List[str]:
         """Extract keywords from text (simple implementation)"""
-        # Remove common words
-        stop_words = {
-            "the",
-            "is",
-            "at",
-            "which",
-            "on",
-            "a",
-            "an",
-            "and",
-            "or",
-            "but",
-            "in",
-            "with",
-            "to",
-            "for",
-            "of",
-            "as",
-            "by",
-            "that",
-            "this",
-            "it",
-            "from",
-            "are",
-            "was",
-            "were",
-            "been",
-            "be",
-            "have",
-            "has",
-            "had",
-        }
-
-        # Extract words
-        words = text.lower().split()
-        keywords = []
-
-        for word in words:
-            # Clean word
-            word = "".join(c for c in word if c.isalnum())
-            if len(word) > 4 and word not in stop_words and word not in keywords:
+        keywords: List[str] = []
+        seen = set()
+        for word in self._keyword_tokens(text):
+            if len(keywords) >= max_keywords:
+                break
+            if word not in seen:
+                seen.add(word)
                 keywords.append(word)
 
-        return keywords[:max_keywords]
+        return keywords
+
+    def _extract_segment_keywords(
+        self, texts: List[str], max_keywords: int = 10
+    ) -> List[List[str]]:
+        """Rank each segment's words by TF-IDF across all segments of the video"""
+        counts = [Counter(self._keyword_tokens(text)) for text in texts]
+        document_frequency = Counter()
+        for segment_counts in counts:
+            document_frequency.update(segment_counts.keys())
+
+        # Smoothed IDF: words found in every segment still score by frequency
+        total = len(texts)
+        idf = {
+            word: math.log((1 + total) / (1 + df)) + 1
+            for word, df in document_frequency.items()
+        }
+        # Counter keeps first-occurrence order, so ties go to the earlier word
+        return [
+            heapq.nlargest(
+                max_keywords,
+                segment_counts,
+                key=lambda word, c=segment_counts: c[word] * idf[word],
+            )
+            for segment_counts in counts
+        ]
@@ -1,7 +1,8 @@
 import asyncio
 import logging
+import time
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional, cast
 
@@ -12,11 +13,12 @@ from app.schemas.models import (
     TaskStatus,
     VideoMetadata,
     VideoSegment,
+    dump_video_segments,
 )
-from app.services.asr_service import ASRService
+from app.services.asr_service import asr_service
 from app.services.db_updater import DBUpdater
 from app.services.llm_service import LLMService
-from app.services.storage_service import storage_service
+from app.services.storage_service import VIDEO_MEDIA_TYPES, storage_service
 from app.services.vision_service import VisionService
 from app.services.websocket_manager import websocket_manager
 
@@ -54,7 +56,7 @@ class VideoPipeline:
     """Main pipeline for processing videos and generating quizzes"""
 
     def __init__(self):
-        self.asr_service = ASRService()
+        self.asr_service = asr_service
         self.vision_service = VisionService()
 
         # Use vLLM or Ollama based on configuration
@@ -102,15 +104,15 @@ class VideoPipeline:
             self.models_preloaded = False
             raise
 
-    def _maybe_unload_models(self):
+    async def _maybe_unload_models(self):
         """Unload models if not in PRELOAD mode"""
         if not settings.MODELS_STAY_IN_MEMORY:
             logger.info("Unloading models to free VRAM")
             try:
-                self.asr_service.unload_model()
-                self.vision_service.unload_model()
-                self.llm_service.unload_model()
-                clear_vram()
+                await self.asr_service.unload_async()
+                await asyncio.to_thread(self.vision_service.unload_model)
+                await asyncio.to_thread(self.llm_service.unload_model)
+                await asyncio.to_thread(clear_vram)
             except Exception as e:
                 logger.warning(f"Error during model cleanup: {e}")
 
@@ -188,16 +190,14 @@ class VideoPipeline:
                 "Transcribing audio (this may take a few minutes)",
             )
             await DBUpdater.set_stage_progress(task_id, "Transcribing audio", 25.0)
-            transcription = await asyncio.to_thread(
-                self.asr_service.transcribe, audio_path
-            )
+            transcription = await self.asr_service.transcribe_async(audio_path)
             task.transcription = transcription
             logger.info(f"Transcription completed: {len(transcription)} segments")
 
-            # Unload ASR model to free VRAM (only if not keeping in memory)
+            # Unload ASR model to free VRAM (only if not keeping in memory);
+            # unload_model clears VRAM itself in that case
             if not settings.MODELS_STAY_IN_MEMORY:
-                await asyncio.to_thread(self.asr_service.unload_model)
-                await asyncio.to_thread(clear_vram)
+                await self.asr_service.unload_async()
 
             # Stage 5: Extract and analyze frames
             await self._update_task_status(
@@ -244,12 +244,14 @@ class VideoPipeline:
             task.segments = segments
             logger.info(f"Generated {len(segments)} segments with quizzes")
 
-            for seg in segments:
+            # Dumped once: reused for the WebSocket events and the DB update
+            segments_json = dump_video_segments(segments)
+            for seg_dict in segments_json:
                 await websocket_manager.send_to_task(
                     task_id,
                     {
                         "event": "segment_ready",
-                        "segment": seg.dict(),
+                        "segment": seg_dict,
                     },
                 )
 
@@ -282,7 +284,6 @@ class VideoPipeline:
             )
 
             # Update database with results
-            segments_json = [seg.dict() for seg in task.segments]
             video_metadata_dict = {
                 "duration": metadata.duration,
                 "width": metadata.width,
@@ -321,15 +322,7 @@ class VideoPipeline:
 
                     # Detect content type
                     ext = video_path.suffix.lower()
-                    content_type_map = {
-                        ".mp4": "video/mp4",
-                        ".avi": "video/x-msvideo",
-                        ".mov": "video/quicktime",
-                        ".mkv": "video/x-matroska",
-                        ".webm": "video/webm",
-                        ".flv": "video/x-flv",
-                    }
-                    content_type = content_type_map.get(ext, "video/mp4")
+                    content_type = VIDEO_MEDIA_TYPES.get(ext, "video/mp4")
 
                     await storage_service.upload_file(
                         video_path,
@@ -342,7 +335,7 @@ class VideoPipeline:
                     # Update database with S3 path
                     from uuid import UUID
 
-                    from sqlalchemy import select, update
+                    from sqlalchemy import update
 
                     from app.db.models import Video
                     from app.db.session import AsyncSessionLocal
@@ -362,16 +355,12 @@ class VideoPipeline:
                         try:
                             task_uuid = UUID(task_id)
                             result = await db.execute(
-                                select(Video).where(Video.task_id == task_uuid)
+                                update(Video)
+                                .where(Video.task_id == task_uuid)
+                                .values(file_path=s3_key)
                             )
-                            video = result.scalar_one_or_none()
-                            if video:
-                                await db.execute(
-                                    update(Video)
-                                    .where(Video.task_id == task_uuid)
-                                    .values(file_path=s3_key)
-                                )
-                                await db.commit()
+                            await db.commit()
+                            if result.rowcount:
                                 logger.info(
                                     f"Updated Video model with S3 path: {s3_key}"
                                 )
@@ -410,7 +399,7 @@ class VideoPipeline:
             # Ensure all models are unloaded (only if not keeping in memory)
             if not settings.MODELS_STAY_IN_MEMORY:
                 try:
-                    await asyncio.to_thread(self.asr_service.unload_model)
+                    await self.asr_service.unload_async()
                     await asyncio.to_thread(self.vision_service.unload_model)
                     await asyncio.to_thread(self.llm_service.unload_model)
                     await asyncio.to_thread(clear_vram)
@@ -434,7 +423,7 @@ class VideoPipeline:
                 task.current_stage = stage
             if message:
                 logger.info(f"Task {task_id}: {message}")
-            task.updated_at = datetime.utcnow()
+            task.updated_at = time.time()
 
             try:
                 await websocket_manager.send_to_task(
@@ -506,8 +495,8 @@ def get_task_status(task_id: str) -> Optional[dict]:
         "progress": task.progress,
         "current_stage": task.current_stage.value if task.current_stage else None,
         "error": task.error,
-        "created_at": task.created_at,
-        "updated_at": task.updated_at,
+        "created_at": datetime.fromtimestamp(task.created_at, tz=timezone.utc),
+        "updated_at": datetime.fromtimestamp(task.updated_at, tz=timezone.utc),
     }
 
 
@@ -559,7 +548,7 @@ async def process_video_from_url(
         task.status = TaskStatus.DOWNLOADING
         task.progress = 5.0
         task.current_stage = ProcessingStage.DOWNLOAD
-        task.updated_at = datetime.utcnow()
+        task.updated_at = time.time()
         logger.info(f"Downloading video from URL: {url}")
 
         # Download video
@@ -592,7 +581,7 @@ async def process_video_from_url(
         logger.error(f"Failed to process video from URL: {e}")
         task.status = TaskStatus.FAILED
         task.error = str(e)
-        task.updated_at = datetime.utcnow()
+        task.updated_at = time.time()
         await DBUpdater.set_failed(task_id, str(e))
         raise
 
@@ -604,11 +593,11 @@ def cleanup_old_tasks(max_age_seconds: int = 86400):
     Args:
         max_age_seconds: Maximum age in seconds (default: 24 hours)
     """
-    now = datetime.utcnow()
+    now = time.time()
     to_remove = []
 
     for task_id, task in TASKS.items():
-        age = (now - task.updated_at).total_seconds()
+        age = now - task.updated_at
         if age > max_age_seconds and task.status in [
             TaskStatus.COMPLETED,
             TaskStatus.FAILED,
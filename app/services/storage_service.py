@@ -3,6 +3,7 @@
 import logging
 from datetime import timedelta
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional
 from urllib.parse import urlparse
 
@@ -13,6 +14,18 @@ from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Video file extension -> MIME type; unknown extensions are served as video/mp4
+VIDEO_MEDIA_TYPES = MappingProxyType(
+    {
+        ".mp4": "video/mp4",
+        ".avi": "video/x-msvideo",
+        ".mov": "video/quicktime",
+        ".mkv": "video/x-matroska",
+        ".webm": "video/webm",
+        ".flv": "video/x-flv",
+    }
+)
+
 
 class StorageService:
     """Service for managing video storage in S3/MinIO."""
@@ -1,12 +1,12 @@
 """Task service for database operations and Redis caching."""
 
-import hashlib
-import json
 import logging
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 
+import blake3
+from redis.asyncio.client import Pipeline
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -16,6 +16,21 @@ from app.services.storage_service import storage_service
 
 logger = logging.getLogger(__name__)
 
+# File hashes carry their algorithm so they never collide with the untagged
+# SHA-256 values stored before BLAKE3; the digest is shortened so the tagged
+# value still fits Task.file_hash String(64)
+FILE_HASH_PREFIX = "blake3:"
+_FILE_HASH_HEX_LENGTH = 64 - len(FILE_HASH_PREFIX)
+
+
+def _tagged_file_hash(hasher) -> str:
+    return FILE_HASH_PREFIX + hasher.hexdigest()[:_FILE_HASH_HEX_LENGTH]
+
+
+def segments_cache_key(task_id: str) -> str:
+    """Redis key holding the serialized segments response for a video."""
+    return f"video_segments:{task_id}"
+
 
 class TaskService:
     """Service for managing tasks in database and cache."""
@@ -26,13 +41,18 @@ class TaskService:
 
     @staticmethod
     def calculate_file_hash(file_path: Path) -> str:
-        """Calculate SHA256 hash of a file."""
-        sha256_hash = hashlib.sha256()
+        """Calculate the tagged BLAKE3 hash of a file."""
+        hasher = blake3.blake3()
         with open(file_path, "rb") as f:
-            # Read file in chunks to handle large files
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+            # Read file in 1 MiB chunks to handle large files
+            for byte_block in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(byte_block)
+        return _tagged_file_hash(hasher)
+
+    @staticmethod
+    def calculate_content_hash(content: bytes) -> str:
+        """Calculate the tagged BLAKE3 hash of in-memory file content."""
+        return _tagged_file_hash(blake3.blake3(content))
 
     async def create_task(
         self,
@@ -56,7 +76,6 @@ class TaskService:
         )
         self.db.add(task)
         await self.db.commit()
-        await self.db.refresh(task)
 
         # Cache task status in Redis
         if self.redis:
@@ -67,21 +86,9 @@ class TaskService:
 
     async def get_task(self, task_id: str) -> Optional[Task]:
         """Get task by ID."""
-        # Try cache first
-        if self.redis:
-            cached_status = await self._get_cached_task_status(task_id)
-            if cached_status:
-                logger.debug(f"Task {task_id} status from cache: {cached_status}")
-
         # Get from database
         result = await self.db.execute(select(Task).where(Task.id == task_id))
-        task = result.scalar_one_or_none()
-
-        if task and self.redis:
-            # Update cache
-            await self._cache_task_status(task)
-
-        return task
+        return result.scalar_one_or_none()
 
     async def get_all_tasks(
         self,
@@ -106,8 +113,13 @@ class TaskService:
         progress: Optional[float] = None,
         current_stage: Optional[str] = None,
         error_message: Optional[str] = None,
+        commit: bool = True,
     ) -> Optional[Task]:
-        """Update task status and progress."""
+        """Update task status and progress.
+
+        With commit=False the change is only flushed, so the caller can commit
+        it together with other writes.
+        """
         task = await self.get_task(task_id)
         if not task:
             return None
@@ -131,8 +143,10 @@ class TaskService:
             task.completed_at = datetime.utcnow()
             task.progress = 100.0 if status == TaskStatus.COMPLETED else task.progress
 
-        await self.db.commit()
-        await self.db.refresh(task)
+        if commit:
+            await self.db.commit()
+        else:
+            await self.db.flush()
 
         # Update cache
         if self.redis:
@@ -147,8 +161,14 @@ class TaskService:
         segments: list,
         duration: Optional[float] = None,
         video_metadata: Optional[dict] = None,
+        commit: bool = True,
+        completed: bool = False,
     ) -> Optional[Task]:
-        """Update task with processing results."""
+        """Update task with processing results (see update_task_status for commit).
+
+        With completed=True the task is also moved to its terminal COMPLETED
+        state in the same write.
+        """
         task = await self.get_task(task_id)
         if not task:
             return None
@@ -158,6 +178,12 @@ class TaskService:
         task.total_quizzes = sum(len(seg.get("quizzes", [])) for seg in segments)
         task.updated_at = datetime.utcnow()
 
+        if completed:
+            task.status = TaskStatus.COMPLETED
+            task.progress = 100.0
+            task.current_stage = "Completed"
+            task.completed_at = task.updated_at
+
         if duration:
             task.duration = duration
 
@@ -166,8 +192,10 @@ class TaskService:
             task.height = video_metadata.get("height")
             task.fps = video_metadata.get("fps")
 
-        await self.db.commit()
-        await self.db.refresh(task)
+        if commit:
+            await self.db.commit()
+        else:
+            await self.db.flush()
 
         # Clear cache to force reload
         if self.redis:
@@ -201,7 +229,6 @@ class TaskService:
             task.original_filename = original_filename
 
         await self.db.commit()
-        await self.db.refresh(task)
 
         logger.info(f"Updated task {task_id} video path to {video_path}")
         return task
@@ -218,7 +245,6 @@ class TaskService:
         task.updated_at = datetime.utcnow()
 
         await self.db.commit()
-        await self.db.refresh(task)
 
         logger.info(f"Updated task {task_id} video title to: {video_title}")
         return task
@@ -253,7 +279,6 @@ class TaskService:
         task.updated_at = datetime.utcnow()
 
         await self.db.commit()
-        await self.db.refresh(task)
 
         logger.info(f"Created share token for task {task_id}: {share_token}")
         return share_token
@@ -301,33 +326,39 @@ class TaskService:
         return True
 
     async def _cache_task_status(self, task: Task):
-        """Cache task status in Redis."""
+        """Cache task status in Redis as one hash, written with HSET + EXPIRE.
+
+        When the service was given a pipeline the commands are only queued and
+        go out with the caller's execute().
+        """
         try:
             cache_key = f"task_status:{task.id}"
             cache_data = {
                 "status": task.status.value,
-                "progress": task.progress,
-                "current_stage": task.current_stage,
-                "error_message": task.error_message,
+                "progress": "" if task.progress is None else task.progress,
+                "current_stage": task.current_stage or "",
+                "error_message": task.error_message or "",
+                "updated_at": task.updated_at.isoformat() if task.updated_at else "",
             }
-            await self.redis.setex(
-                cache_key,
-                settings.REDIS_CACHE_TTL,
-                json.dumps(cache_data),
-            )
+            if isinstance(self.redis, Pipeline):
+                pipe = self.redis
+            else:
+                pipe = self.redis.pipeline(transaction=False)
+            pipe.hset(cache_key, mapping=cache_data)
+            pipe.expire(cache_key, settings.REDIS_CACHE_TTL)
+            if pipe is not self.redis:
+                await pipe.execute()
         except Exception as e:
             logger.warning(f"Failed to cache task status: {e}")
 
-    async def _get_cached_task_status(self, task_id: str) -> Optional[dict]:
-        """Get cached task status from Redis."""
+    async def invalidate_segments_cache(self, task_id: str):
+        """Drop the cached segments response so the next read hits the DB."""
+        if not self.redis:
+            return
         try:
-            cache_key = f"task_status:{task_id}"
-            cached = await self.redis.get(cache_key)
-            if cached:
-                return json.loads(cached)
+            await self.redis.delete(segments_cache_key(task_id))
         except Exception as e:
-            logger.warning(f"Failed to get cached task status: {e}")
-        return None
+            logger.warning(f"Failed to invalidate segments cache: {e}")
 
     async def _invalidate_task_cache(self, task_id: str):
         """Invalidate task cache in Redis."""
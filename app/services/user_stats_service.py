@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import math
 from datetime import datetime
 from typing import List, Optional, Tuple
 
@@ -20,6 +19,7 @@ from app.schemas.user import (
     UserStatsResponse,
     UserTopicsResponse,
 )
+from app.schemas.video import intern_language
 
 
 def _safe_accuracy(total: int, correct: int) -> float:
@@ -68,7 +68,7 @@ class UserStatsService:
         # Streaks are not yet stored; return 0 as placeholder.
         current_streak = 0
 
-        return UserProfileResponse(
+        return UserProfileResponse.model_construct(
             user_id=user_id,
             email="",  # email not fetched here; caller can enrich if needed
             videos_watched=videos_watched or 0,
@@ -99,7 +99,7 @@ class UserStatsService:
         )
         total_videos = (await self.db.execute(total_videos_stmt)).scalar_one() or 0
 
-        return UserStatsResponse(
+        return UserStatsResponse.model_construct(
             total_videos_watched=total_videos,
             total_questions_answered=total_questions,
             total_correct_answers=total_correct,
@@ -138,7 +138,6 @@ class UserStatsService:
 
         total_items_stmt = select(func.count()).select_from(base_query.subquery())
         total_items = (await self.db.execute(total_items_stmt)).scalar_one() or 0
-        total_pages = max(1, math.ceil(total_items / page_size))
 
         paginated_stmt = base_query.limit(page_size).offset(offset)
         rows = (await self.db.execute(paginated_stmt)).all()
@@ -147,26 +146,25 @@ class UserStatsService:
         for row in rows:
             score = _safe_accuracy(row.answered, row.correct)
             items.append(
-                UserHistoryItem(
+                UserHistoryItem.model_construct(
                     task_id=str(row.task_id) if row.task_id else None,
                     title=row.title,
                     watched_at=row.watched_at,
                     questions_answered=row.answered,
                     correct_answers=row.correct,
                     score_percentage=score,
-                    language=row.language,
+                    language=intern_language(row.language),
                     status=row.status.value if row.status else None,
                 )
             )
 
-        pagination = PaginationMeta(
+        pagination = PaginationMeta.model_construct(
             page=page,
             page_size=page_size,
             total_items=total_items,
-            total_pages=total_pages,
         )
 
-        return UserHistoryResponse(items=items, pagination=pagination)
+        return UserHistoryResponse.model_construct(items=items, pagination=pagination)
 
     # ------------------------------------------------------------------ #
     # Topics
@@ -174,7 +172,7 @@ class UserStatsService:
     async def get_topics(self, user_id: int, limit: int = 10) -> UserTopicsResponse:
         """Return top topics/keywords aggregated from segment keywords."""
         topics = await self._topics(user_id, limit=limit)
-        return UserTopicsResponse(topics=topics)
+        return UserTopicsResponse.model_construct(topics=topics)
 
     # ------------------------------------------------------------------ #
     # Internals
@@ -215,7 +213,7 @@ class UserStatsService:
         for row in rows:
             accuracy = _safe_accuracy(row.answered, row.correct)
             topics.append(
-                TopicStats(
+                TopicStats.model_construct(
                     topic=row.topic,
                     total_answered=row.answered,
                     correct_answers=row.correct,
@@ -250,7 +248,7 @@ class UserStatsService:
         items: List[RecentActivityItem] = []
         for row in rows:
             items.append(
-                RecentActivityItem(
+                RecentActivityItem.model_construct(
                     task_id=str(row.task_id) if row.task_id else None,
                     title=row.title,
                     watched_at=row.watched_at,
@@ -283,10 +283,14 @@ Respond with ONLY valid JSON:
 
                 # Add translations
                 if f"question_{language}" in quiz_data:
-                    quiz.translations[language] = QuizTranslation(
-                        question=quiz_data.get(f"question_{language}", ""),
-                        options=quiz_data.get(f"options_{language}", []),
-                        explanation=quiz_data.get(f"explanation_{language}", ""),
+                    setattr(
+                        quiz.translations,
+                        language,
+                        QuizTranslation(
+                            question=quiz_data.get(f"question_{language}", ""),
+                            options=quiz_data.get(f"options_{language}", []),
+                            explanation=quiz_data.get(f"explanation_{language}", ""),
+                        ),
                     )
 
                 quizzes.append(quiz)
@@ -111,6 +111,9 @@ def main():
             host=settings.HOST,
             port=settings.PORT,
             reload=settings.DEBUG,
+            workers=None if settings.DEBUG else settings.WORKERS,
+            loop="uvloop",
+            http="httptools",
             log_level="info",
             access_log=True,
         )